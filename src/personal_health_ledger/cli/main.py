@@ -4,6 +4,8 @@ Command-line interface for Personal Health Ledger.
 Provides commands for syncing, building, comparing, and processing health data.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from datetime import timezone as dt_timezone
 from pathlib import Path
@@ -11,38 +13,295 @@ from typing import Any
 
 import typer
 
-from personal_health_ledger.domain.weight import RawWeightRecord
-from personal_health_ledger.infrastructure.drive_client.client import DriveClient
-from personal_health_ledger.infrastructure.parsers.csv_parser import CSVParser
-from personal_health_ledger.infrastructure.parsers.fit_parser import FITParser
-from personal_health_ledger.services.comparison import ComparisonService
-from personal_health_ledger.services.consolidation import ConsolidationService
-from personal_health_ledger.services.daily_consolidation import DailyConsolidationService
-from personal_health_ledger.services.output import OutputService
+# Parsers, services, and the Drive client are imported inside the functions
+# that use them: they pull in pandas/pyarrow/fitparse/googleapiclient, which
+# would otherwise be paid on every CLI startup including `--help`.
+from personal_health_ledger.domain.weight import RawWeightBatch
 from personal_health_ledger.utils.exceptions import PersonalHealthLedgerError
 from personal_health_ledger.utils.logging_config import get_logger, setup_logging
-from personal_health_ledger.utils.parameters import ParameterLoader
+from personal_health_ledger.utils.parameters import (
+    CSVConfig,
+    FITConfig,
+    ParameterLoader,
+    ProcessingConfig,
+)
 
 app = typer.Typer(help="Personal Health Ledger - Health data consolidation and auditing")
 
 logger = get_logger(__name__)
 
 
+def _parse_raw_dir(
+    raw_dir: Path,
+    csv_config: CSVConfig,
+    fit_config: FITConfig,
+    processing_config: ProcessingConfig,
+    echo: bool = True,
+) -> tuple[list[RawWeightBatch], list[RawWeightBatch], list[dict[str, Any]]]:
+    """
+    Parse all CSV and FIT files in a directory concurrently.
+
+    Parsing is CPU-bound and per-file independent, so files are submitted
+    to a process pool and results collected as they complete.
+
+    Args:
+        raw_dir: Directory containing raw data files.
+        csv_config: CSV parsing configuration.
+        fit_config: FIT parsing configuration.
+        processing_config: Processing configuration.
+        echo: If True, echo a progress line per parsed file.
+
+    Returns:
+        Tuple of (csv_batches, fit_batches, ingestion_events).
+    """
+    csv_files: list[Path] = []
+    fit_files: list[Path] = []
+    ingestion_events: list[dict[str, Any]] = []
+
+    # One timestamp for the whole ingestion pass; event ordering is what
+    # matters, so each event carries its order index instead of its own
+    # clock reading.
+    ingest_start_iso = datetime.now(dt_timezone.utc).isoformat()
+
+    # os.scandir returns DirEntry objects whose is_file() answer is cached
+    # from the directory read, avoiding one stat syscall per file.
+    with os.scandir(raw_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix == ".csv":
+                csv_files.append(Path(entry.path))
+            elif suffix == ".fit":
+                fit_files.append(Path(entry.path))
+            else:
+                ingestion_events.append(
+                    {
+                        "timestamp": ingest_start_iso,
+                        "order": len(ingestion_events),
+                        "file": entry.name,
+                        "action": "parse",
+                        "status": "skipped",
+                        "reason": "unsupported_format",
+                    }
+                )
+
+    csv_batches: list[RawWeightBatch] = []
+    fit_batches: list[RawWeightBatch] = []
+
+    if not csv_files and not fit_files:
+        return csv_batches, fit_batches, ingestion_events
+
+    from personal_health_ledger.infrastructure.parsers.batch import (
+        parse_csv_file,
+        parse_fit_file,
+    )
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures: dict[Any, tuple[Path, list[RawWeightBatch]]] = {
+            executor.submit(
+                parse_csv_file, path, path.name, csv_config, processing_config
+            ): (path, csv_batches)
+            for path in csv_files
+        }
+        futures.update(
+            {
+                executor.submit(
+                    parse_fit_file, path, path.name, fit_config, processing_config
+                ): (path, fit_batches)
+                for path in fit_files
+            }
+        )
+
+        # Collect progress lines and emit them in one write after the pool
+        # drains: one syscall instead of one per file, and no interleaving
+        # with worker output.
+        echo_lines: list[str] = []
+
+        for future in as_completed(futures):
+            path, target = futures[future]
+            event: dict[str, Any] = {
+                "timestamp": ingest_start_iso,
+                "order": len(ingestion_events),
+                "file": path.name,
+                "action": "parse",
+            }
+
+            try:
+                batch = future.result()
+                target.append(batch)
+                event["status"] = "success"
+                event["records"] = len(batch)
+                echo_lines.append(f"Parsed {len(batch)} records from {path.name}")
+
+            except Exception as e:
+                event["status"] = "error"
+                event["error"] = str(e)
+                logger.error(f"Failed to parse {path.name}: {e}")
+
+            ingestion_events.append(event)
+
+    if echo and echo_lines:
+        typer.echo("\n".join(echo_lines))
+
+    return csv_batches, fit_batches, ingestion_events
+
+
+def _load_parameters(config_path: str) -> ParameterLoader:
+    """
+    Load a parameter loader for a configuration path.
+
+    Each call returns a fresh loader with its own config copy — commands
+    mutate config fields from CLI options, so instances must not be
+    shared — while the YAML parse itself stays cached inside
+    ParameterLoader.
+    """
+    return ParameterLoader(config_path)
+
+
 def init_config(config_path: str = "config/config.yaml") -> ParameterLoader:
     """
     Initialize configuration and logging.
 
+    The YAML parse and logging setup are cached, so repeated command
+    invocations in one process reuse the same loader.
+
     Args:
         config_path: Path to configuration file.
 
     Returns:
         Parameter loader instance.
     """
-    param_loader = ParameterLoader(config_path)
+    param_loader = _load_parameters(config_path)
     setup_logging(param_loader.get_logging_config(), "personal_health_ledger")
     return param_loader
 
 
+def _run_sync(param_loader: ParameterLoader, force: bool = False) -> None:
+    """
+    Sync files from Google Drive using an already-loaded configuration.
+
+    Args:
+        param_loader: Loaded parameter loader.
+        force: Force re-download of all files.
+    """
+    from personal_health_ledger.infrastructure.drive_client.client import DriveClient
+
+    drive_config = param_loader.get_drive_config()
+
+    logger.info("Starting Google Drive sync")
+
+    drive_client = DriveClient(drive_config)
+    local_paths = drive_client.sync_folder(force=force)
+
+    typer.echo(f"Successfully synced {len(local_paths)} files")
+    for path in local_paths:
+        typer.echo(f"  - {path.name}")
+
+
+def _run_build(
+    param_loader: ParameterLoader,
+    csv_batches: list[RawWeightBatch],
+    fit_batches: list[RawWeightBatch],
+    ingestion_events: list[dict[str, Any]],
+) -> None:
+    """
+    Consolidate already-parsed batches and write build outputs.
+
+    Args:
+        param_loader: Loaded parameter loader.
+        csv_batches: Parsed CSV batches.
+        fit_batches: Parsed FIT batches.
+        ingestion_events: Ingestion events from parsing.
+    """
+    from personal_health_ledger.services.consolidation import ConsolidationService
+    from personal_health_ledger.services.output import OutputService
+
+    processing_config = param_loader.get_processing_config()
+    output_config = param_loader.get_output_config()
+
+    all_records = RawWeightBatch.concat(csv_batches + fit_batches)
+
+    if not len(all_records):
+        raise PersonalHealthLedgerError("No records parsed from raw files")
+
+    logger.info(f"Parsed total of {len(all_records)} records")
+
+    consolidation_service = ConsolidationService(processing_config)
+    result = consolidation_service.consolidate(all_records)
+
+    typer.echo(f"Consolidated to {len(result.measurements)} measurements")
+
+    output_service = OutputService(output_config)
+    output_service.write_all(result.measurements)
+    output_service.write_ingestion_log(ingestion_events)
+
+    typer.echo(f"Found {result.conflicts_count} measurements with conflicts")
+    typer.echo(f"Output written to {output_config.dir}/")
+
+
+def _run_compare(
+    param_loader: ParameterLoader,
+    csv_batches: list[RawWeightBatch],
+    fit_batches: list[RawWeightBatch],
+) -> None:
+    """
+    Compare already-parsed CSV and FIT batches and write the summary.
+
+    Args:
+        param_loader: Loaded parameter loader.
+        csv_batches: Parsed CSV batches.
+        fit_batches: Parsed FIT batches.
+    """
+    from personal_health_ledger.services.comparison import ComparisonService
+    from personal_health_ledger.services.output import OutputService
+
+    processing_config = param_loader.get_processing_config()
+    output_config = param_loader.get_output_config()
+
+    comparison_service = ComparisonService(processing_config)
+    results = comparison_service.compare(
+        RawWeightBatch.concat(csv_batches), RawWeightBatch.concat(fit_batches)
+    )
+
+    output_service = OutputService(output_config)
+    output_service.write_comparison_summary(results)
+
+    typer.echo(f"Compared {len(results)} file pairs")
+    for result in results:
+        typer.echo(f"\n{result.csv_file_name} vs {result.fit_file_name}:")
+        typer.echo(f"  CSV only: {result.csv_only_count}")
+        typer.echo(f"  FIT only: {result.fit_only_count}")
+        typer.echo(f"  Both: {result.both_count}")
+        if result.mismatches:
+            typer.echo(f"  Mismatches: {dict(result.mismatches)}")
+        if result.weight_mae is not None:
+            typer.echo(f"  Weight MAE: {result.weight_mae:.3f} kg")
+
+    typer.echo(f"\nComparison summary written to {output_config.dir}/")
+
+
+def _run_daily(input_file: Path, output_file: Path) -> None:
+    """
+    Generate daily consolidated data from a consolidated CSV file.
+
+    Args:
+        input_file: Path to input consolidated file.
+        output_file: Path to output daily consolidated file.
+    """
+    from personal_health_ledger.services.daily_consolidation import (
+        DailyConsolidationService,
+    )
+
+    logger.info("Starting daily consolidation")
+
+    service = DailyConsolidationService()
+    service.consolidate_by_day(input_file, output_file)
+
+    typer.echo(f"\n✅ Daily consolidated file created: {output_file}")
+
+
 @app.command()
 def sync(
     config_path: str = typer.Option("config/config.yaml", help="Path to configuration file"),
@@ -65,14 +324,7 @@ def sync(
         if folder_name:
             drive_config.folder_name = folder_name
 
-        logger.info("Starting Google Drive sync")
-
-        drive_client = DriveClient(drive_config)
-        local_paths = drive_client.sync_folder(force=force)
-
-        typer.echo(f"Successfully synced {len(local_paths)} files")
-        for path in local_paths:
-            typer.echo(f"  - {path.name}")
+        _run_sync(param_loader, force=force)
 
     except PersonalHealthLedgerError as e:
         logger.error(f"Sync failed: {e}")
@@ -120,64 +372,11 @@ def build(
         if not raw_dir.exists():
             raise PersonalHealthLedgerError(f"Raw data directory not found: {raw_dir}")
 
-        csv_parser = CSVParser(csv_config, processing_config)
-        fit_parser = FITParser(fit_config, processing_config)
-
-        all_records: list[RawWeightRecord] = []
-        ingestion_events = []
-
-        for file_path in raw_dir.iterdir():
-            if file_path.is_file():
-                event: dict[str, Any] = {
-                    "timestamp": datetime.now(dt_timezone.utc).isoformat(),
-                    "file": file_path.name,
-                    "action": "parse",
-                }
-
-                try:
-                    if file_path.suffix.lower() == ".csv":
-                        records = csv_parser.parse(file_path, file_path.name)
-                        all_records.extend(records)
-                        event["status"] = "success"
-                        event["records"] = len(records)
-                        typer.echo(f"Parsed {len(records)} records from {file_path.name}")
-
-                    elif file_path.suffix.lower() == ".fit":
-                        records = fit_parser.parse(file_path, file_path.name)
-                        all_records.extend(records)
-                        event["status"] = "success"
-                        event["records"] = len(records)
-                        typer.echo(f"Parsed {len(records)} records from {file_path.name}")
-
-                    else:
-                        event["status"] = "skipped"
-                        event["reason"] = "unsupported_format"
-
-                except Exception as e:
-                    event["status"] = "error"
-                    event["error"] = str(e)
-                    logger.error(f"Failed to parse {file_path.name}: {e}")
-
-                ingestion_events.append(event)
+        csv_batches, fit_batches, ingestion_events = _parse_raw_dir(
+            raw_dir, csv_config, fit_config, processing_config
+        )
 
-        if not all_records:
-            raise PersonalHealthLedgerError("No records parsed from raw files")
-
-        logger.info(f"Parsed total of {len(all_records)} records")
-
-        consolidation_service = ConsolidationService(processing_config)
-        consolidated = consolidation_service.consolidate(all_records)
-
-        typer.echo(f"Consolidated to {len(consolidated)} measurements")
-
-        output_service = OutputService(output_config)
-        output_service.write_consolidated_data(consolidated)
-        output_service.write_conflicts(consolidated)
-        output_service.write_ingestion_log(ingestion_events)
-
-        conflicts_count = len([m for m in consolidated if m.conflicting_fields])
-        typer.echo(f"Found {conflicts_count} measurements with conflicts")
-        typer.echo(f"Output written to {output_config.dir}/")
+        _run_build(param_loader, csv_batches, fit_batches, ingestion_events)
 
     except PersonalHealthLedgerError as e:
         logger.error(f"Build failed: {e}")
@@ -203,7 +402,6 @@ def compare(
         csv_config = param_loader.get_csv_config()
         fit_config = param_loader.get_fit_config()
         processing_config = param_loader.get_processing_config()
-        output_config = param_loader.get_output_config()
 
         if tolerance_seconds:
             processing_config.timestamp_tolerance_seconds = tolerance_seconds
@@ -212,44 +410,11 @@ def compare(
 
         raw_dir = Path(param_loader.get_drive_config().cache_dir)
 
-        csv_parser = CSVParser(csv_config, processing_config)
-        fit_parser = FITParser(fit_config, processing_config)
-
-        csv_records: list[RawWeightRecord] = []
-        fit_records: list[RawWeightRecord] = []
-
-        for file_path in raw_dir.iterdir():
-            if file_path.is_file():
-                try:
-                    if file_path.suffix.lower() == ".csv":
-                        records = csv_parser.parse(file_path, file_path.name)
-                        csv_records.extend(records)
-
-                    elif file_path.suffix.lower() == ".fit":
-                        records = fit_parser.parse(file_path, file_path.name)
-                        fit_records.extend(records)
-
-                except Exception as e:
-                    logger.error(f"Failed to parse {file_path.name}: {e}")
-
-        comparison_service = ComparisonService(processing_config)
-        results = comparison_service.compare(csv_records, fit_records)
-
-        output_service = OutputService(output_config)
-        output_service.write_comparison_summary(results)
+        csv_batches, fit_batches, _ = _parse_raw_dir(
+            raw_dir, csv_config, fit_config, processing_config, echo=False
+        )
 
-        typer.echo(f"Compared {len(results)} file pairs")
-        for result in results:
-            typer.echo(f"\n{result.csv_file_name} vs {result.fit_file_name}:")
-            typer.echo(f"  CSV only: {result.csv_only_count}")
-            typer.echo(f"  FIT only: {result.fit_only_count}")
-            typer.echo(f"  Both: {result.both_count}")
-            if result.mismatches:
-                typer.echo(f"  Mismatches: {dict(result.mismatches)}")
-            if result.weight_mae is not None:
-                typer.echo(f"  Weight MAE: {result.weight_mae:.3f} kg")
-
-        typer.echo(f"\nComparison summary written to {output_config.dir}/")
+        _run_compare(param_loader, csv_batches, fit_batches)
 
     except PersonalHealthLedgerError as e:
         logger.error(f"Comparison failed: {e}")
@@ -270,14 +435,9 @@ def daily(
     across multiple measurements.
     """
     try:
-        param_loader = init_config(config_path)
-        
-        logger.info("Starting daily consolidation")
-        
-        service = DailyConsolidationService()
-        service.consolidate_by_day(Path(input_file), Path(output_file))
-        
-        typer.echo(f"\n✅ Daily consolidated file created: {output_file}")
+        init_config(config_path)
+
+        _run_daily(Path(input_file), Path(output_file))
 
     except PersonalHealthLedgerError as e:
         logger.error(f"Daily consolidation failed: {e}")
@@ -294,19 +454,37 @@ def all(
     Run complete pipeline: sync, build, compare, and daily consolidation.
 
     Executes the full workflow from Drive sync to daily consolidated output.
+    Configuration is loaded once and raw files are parsed once, feeding
+    both consolidation and comparison.
     """
     try:
+        param_loader = init_config(config_path)
+
         typer.echo("=== Step 1: Syncing from Google Drive ===")
-        sync(config_path=config_path, folder_id=None, folder_name=None, force=force_sync)
+        _run_sync(param_loader, force=force_sync)
 
         typer.echo("\n=== Step 2: Building consolidated dataset ===")
-        build(config_path=config_path, timezone=None, tolerance_seconds=None, output_format=None)
+
+        raw_dir = Path(param_loader.get_drive_config().cache_dir)
+        if not raw_dir.exists():
+            raise PersonalHealthLedgerError(f"Raw data directory not found: {raw_dir}")
+
+        csv_batches, fit_batches, ingestion_events = _parse_raw_dir(
+            raw_dir,
+            param_loader.get_csv_config(),
+            param_loader.get_fit_config(),
+            param_loader.get_processing_config(),
+        )
+
+        _run_build(param_loader, csv_batches, fit_batches, ingestion_events)
 
         typer.echo("\n=== Step 3: Comparing CSV vs FIT ===")
-        compare(config_path=config_path, tolerance_seconds=None)
+        _run_compare(param_loader, csv_batches, fit_batches)
 
         typer.echo("\n=== Step 4: Generating daily consolidation ===")
-        daily(config_path=config_path, input_file="output/weight_consolidated.csv", output_file="output/weight_daily.csv")
+        _run_daily(
+            Path("output/weight_consolidated.csv"), Path("output/weight_daily.csv")
+        )
 
         typer.echo("\n=== Pipeline completed successfully ===")
 
@@ -5,11 +5,63 @@ This module defines the canonical schema for weight measurements,
 including data lineage and metadata tracking.
 """
 
+import json
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime, timezone
+from datetime import tzinfo as dt_tzinfo
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a listed dependency
+    orjson = None  # type: ignore[assignment]
+
+from personal_health_ledger.utils.timezone_utils import datetime_to_ns
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string, using orjson's C encoder when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+NUMERIC_FIELDS: tuple[str, ...] = (
+    "weight_kg",
+    "body_fat_pct",
+    "fat_mass_kg",
+    "fat_free_pct",
+    "fat_free_mass_kg",
+    "skeletal_muscle_pct",
+    "skeletal_muscle_mass_kg",
+    "muscle_pct",
+    "muscle_mass_kg",
+    "bone_mass_kg",
+    "body_water",
+    "bmr_kcal",
+    "metabolic_age",
+    "visceral_fat_rating",
+)
+
+
+@lru_cache(maxsize=4096)
+def cached_json_list(key: tuple[str, ...]) -> str:
+    """JSON-encode a tuple as a list, memoized across rows.
+
+    Lineage containers (source files, types, conflicting fields) repeat
+    heavily across measurements that share source files, so encoding each
+    unique value once collapses N serializations to the unique-value count.
+    """
+    return _dumps(list(key))
+
+
+@lru_cache(maxsize=4096)
+def cached_json_dict(items: tuple[tuple[str, str], ...]) -> str:
+    """JSON-encode sorted (key, value) pairs as a dict, memoized across rows."""
+    return _dumps(dict(items))
 
 
 class SourceType(str, Enum):
@@ -28,70 +80,57 @@ class FieldSource(str, Enum):
     CONFLICT = "conflict"
 
 
-class WeightMeasurement(BaseModel):
+# Packed uint8 codes for the source_type column of RawWeightBatch: one byte
+# per row instead of a Python string object, so "rows where source is CSV"
+# becomes a vectorized integer comparison.
+SOURCE_TYPE_FROM_CODE: tuple[SourceType, ...] = (SourceType.CSV, SourceType.FIT)
+SOURCE_TYPE_TO_CODE: dict[SourceType, int] = {
+    source: code for code, source in enumerate(SOURCE_TYPE_FROM_CODE)
+}
+
+
+@dataclass(slots=True, kw_only=True)
+class WeightMeasurement:
     """
     Canonical weight measurement model with full data lineage.
 
-    All numeric measurements use float32-compatible types for efficiency.
-    Timestamps are timezone-aware.
+    A plain slotted dataclass rather than a Pydantic model: measurements are
+    internal data carriers built from already-validated columns, so per-row
+    validation overhead is wasted. Timestamps are timezone-aware.
     """
 
-    record_id: str = Field(description="Deterministic record identifier (hash)")
-    timestamp: datetime = Field(description="Measurement timestamp (timezone-aware)")
-
-    weight_kg: float | None = Field(None, description="Weight in kilograms")
-    body_fat_pct: float | None = Field(None, description="Body fat percentage")
-    fat_mass_kg: float | None = Field(None, description="Fat mass in kilograms")
-    fat_free_pct: float | None = Field(None, description="Fat-free percentage")
-    fat_free_mass_kg: float | None = Field(None, description="Fat-free mass in kilograms")
-    skeletal_muscle_pct: float | None = Field(None, description="Skeletal muscle percentage")
-    skeletal_muscle_mass_kg: float | None = Field(
-        None, description="Skeletal muscle mass in kilograms"
-    )
-    muscle_pct: float | None = Field(None, description="Muscle percentage")
-    muscle_mass_kg: float | None = Field(None, description="Muscle mass in kilograms")
-    bone_mass_kg: float | None = Field(None, description="Bone mass in kilograms")
-    body_water: float | None = Field(None, description="Body water (percentage or absolute)")
-    bmr_kcal: float | None = Field(None, description="Basal metabolic rate in kcal")
-    metabolic_age: float | None = Field(None, description="Metabolic age in years")
-    visceral_fat_rating: float | None = Field(None, description="Visceral fat rating")
-
-    source_files: list[str] = Field(
-        default_factory=list, description="List of source file names"
-    )
-    source_types: set[SourceType] = Field(
-        default_factory=set, description="Set of source types contributing to this record"
-    )
-    drive_file_ids: list[str] = Field(
-        default_factory=list, description="List of Google Drive file IDs"
-    )
-    ingestion_timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), description="Processing timestamp (UTC)"
-    )
-    field_sources: dict[str, FieldSource] = Field(
-        default_factory=dict,
-        description="Mapping of field names to their source resolution type",
-    )
-    conflicting_fields: list[str] = Field(
-        default_factory=list, description="List of fields with CSV vs FIT conflicts"
-    )
-    chosen_source: SourceType | None = Field(
-        None, description="Chosen source for conflict resolution (if policy applied)"
-    )
+    record_id: str
+    timestamp: datetime
 
-    weight_kg_csv: float | None = Field(None, description="Weight from CSV (if conflict)")
-    weight_kg_fit: float | None = Field(None, description="Weight from FIT (if conflict)")
-    body_fat_pct_csv: float | None = Field(
-        None, description="Body fat percentage from CSV (if conflict)"
-    )
-    body_fat_pct_fit: float | None = Field(
-        None, description="Body fat percentage from FIT (if conflict)"
-    )
+    weight_kg: float | None = None
+    body_fat_pct: float | None = None
+    fat_mass_kg: float | None = None
+    fat_free_pct: float | None = None
+    fat_free_mass_kg: float | None = None
+    skeletal_muscle_pct: float | None = None
+    skeletal_muscle_mass_kg: float | None = None
+    muscle_pct: float | None = None
+    muscle_mass_kg: float | None = None
+    bone_mass_kg: float | None = None
+    body_water: float | None = None
+    bmr_kcal: float | None = None
+    metabolic_age: float | None = None
+    visceral_fat_rating: float | None = None
 
-    model_config = ConfigDict(
-        use_enum_values=True,
-        # Note: json_encoders is handled in to_dict() method for Pydantic v2
+    source_files: list[str] = field(default_factory=list)
+    source_types: set[SourceType] = field(default_factory=set)
+    drive_file_ids: list[str] = field(default_factory=list)
+    ingestion_timestamp: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
     )
+    field_sources: dict[str, FieldSource] = field(default_factory=dict)
+    conflicting_fields: list[str] = field(default_factory=list)
+    chosen_source: SourceType | None = None
+
+    weight_kg_csv: float | None = None
+    weight_kg_fit: float | None = None
+    body_fat_pct_csv: float | None = None
+    body_fat_pct_fit: float | None = None
 
     def to_dict(self, for_csv: bool = False) -> dict[str, Any]:
         """
@@ -103,16 +142,18 @@ class WeightMeasurement(BaseModel):
         Returns:
             Dictionary representation of the measurement.
         """
-        import json
-
-        data = self.model_dump()
+        data = asdict(self)
 
         if for_csv:
-            data["source_files"] = json.dumps(data["source_files"])
-            data["source_types"] = json.dumps(list(data["source_types"]))
-            data["drive_file_ids"] = json.dumps(data["drive_file_ids"])
-            data["field_sources"] = json.dumps(data["field_sources"])
-            data["conflicting_fields"] = json.dumps(data["conflicting_fields"])
+            data["source_files"] = cached_json_list(tuple(data["source_files"]))
+            data["source_types"] = cached_json_list(tuple(sorted(data["source_types"])))
+            data["drive_file_ids"] = cached_json_list(tuple(data["drive_file_ids"]))
+            data["field_sources"] = cached_json_dict(
+                tuple(sorted(data["field_sources"].items()))
+            )
+            data["conflicting_fields"] = cached_json_list(
+                tuple(data["conflicting_fields"])
+            )
 
         data["timestamp"] = (
             data["timestamp"].isoformat() if isinstance(data["timestamp"], datetime) else data["timestamp"]
@@ -126,14 +167,16 @@ class WeightMeasurement(BaseModel):
         return data
 
 
-class RawWeightRecord(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class RawWeightRecord:
     """
     Raw weight record from a single source (CSV or FIT).
 
-    Used during ingestion before consolidation.
+    Used during ingestion before consolidation; bulk ingestion uses the
+    columnar RawWeightBatch instead.
     """
 
-    timestamp: datetime = Field(description="Measurement timestamp (timezone-aware)")
+    timestamp: datetime
     weight_kg: float | None = None
     body_fat_pct: float | None = None
     fat_mass_kg: float | None = None
@@ -149,8 +192,157 @@ class RawWeightRecord(BaseModel):
     metabolic_age: float | None = None
     visceral_fat_rating: float | None = None
 
-    source_file_name: str = Field(description="Name of the source file")
-    source_file_id: str = Field(description="Drive file ID or local file identifier")
-    source_type: SourceType = Field(description="Type of source (CSV or FIT)")
+    source_file_name: str = ""
+    source_file_id: str = ""
+    source_type: SourceType = SourceType.CSV
+
+
+@dataclass
+class RawWeightBatch:
+    """
+    Columnar (structure-of-arrays) batch of raw weight records.
+
+    Stores one float32 array per numeric field (NaN for missing values;
+    kg/percent readings never need float64 precision and the narrower
+    dtype halves memory traffic on batch scans),
+    a datetime64[ns] timestamp array in UTC, parallel string arrays for
+    source file metadata, and a packed uint8 source-type code column
+    (see SOURCE_TYPE_FROM_CODE). Avoids per-record Python object
+    overhead during ingestion of large CSV/FIT files.
+    """
+
+    timestamp: np.ndarray
+    weight_kg: np.ndarray
+    body_fat_pct: np.ndarray
+    fat_mass_kg: np.ndarray
+    fat_free_pct: np.ndarray
+    fat_free_mass_kg: np.ndarray
+    skeletal_muscle_pct: np.ndarray
+    skeletal_muscle_mass_kg: np.ndarray
+    muscle_pct: np.ndarray
+    muscle_mass_kg: np.ndarray
+    bone_mass_kg: np.ndarray
+    body_water: np.ndarray
+    bmr_kcal: np.ndarray
+    metabolic_age: np.ndarray
+    visceral_fat_rating: np.ndarray
+    source_file_name: np.ndarray
+    source_file_id: np.ndarray
+    source_type: np.ndarray
+    tzinfo: dt_tzinfo | None = None
+
+    def __len__(self) -> int:
+        """Number of records in the batch."""
+        return len(self.timestamp)
+
+    @property
+    def timestamp_ns(self) -> np.ndarray:
+        """Timestamps as an int64 array of nanoseconds since the UTC epoch."""
+        return self.timestamp.view(np.int64)
+
+    def numeric_value(self, field_name: str, index: int) -> float | None:
+        """
+        Get a single numeric value, converting NaN back to None.
+
+        Args:
+            field_name: Name of the numeric field.
+            index: Row index within the batch.
+
+        Returns:
+            Float value or None if the value is missing.
+        """
+        value = getattr(self, field_name)[index]
+        return None if np.isnan(value) else float(value)
+
+    def source_type_at(self, index: int) -> SourceType:
+        """Decode the packed source-type code at a row index."""
+        return SOURCE_TYPE_FROM_CODE[int(self.source_type[index])]
+
+    @classmethod
+    def empty(cls) -> "RawWeightBatch":
+        """Create an empty batch."""
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(cls, rows: list[dict[str, Any]]) -> "RawWeightBatch":
+        """
+        Build a batch from row dictionaries.
+
+        Args:
+            rows: List of dictionaries with "timestamp", "source_file_name",
+                "source_file_id", "source_type", and numeric field keys
+                (missing numeric keys become NaN).
+
+        Returns:
+            Columnar batch of raw weight records.
+        """
+        tz = rows[0]["timestamp"].tzinfo if rows else None
+        n_rows = len(rows)
+
+        # Write each row straight into pre-sized output arrays rather than
+        # accumulating intermediate Python lists per column.
+        timestamp_ns = np.empty(n_rows, dtype=np.int64)
+        source_file_name = np.empty(n_rows, dtype=object)
+        source_file_id = np.empty(n_rows, dtype=object)
+        source_type = np.empty(n_rows, dtype=np.uint8)
+        numeric_columns = {
+            name: np.empty(n_rows, dtype=np.float32) for name in NUMERIC_FIELDS
+        }
+
+        for i, row in enumerate(rows):
+            timestamp_ns[i] = datetime_to_ns(row["timestamp"])
+            source_file_name[i] = row["source_file_name"]
+            source_file_id[i] = row["source_file_id"]
+            source_type[i] = SOURCE_TYPE_TO_CODE[SourceType(row["source_type"])]
+            for name, column in numeric_columns.items():
+                value = row.get(name)
+                column[i] = np.nan if value is None else value
+
+        return cls(
+            timestamp=timestamp_ns.view("datetime64[ns]"),
+            source_file_name=source_file_name,
+            source_file_id=source_file_id,
+            source_type=source_type,
+            tzinfo=tz,
+            **numeric_columns,
+        )
+
+    @classmethod
+    def from_records(cls, records: list[RawWeightRecord]) -> "RawWeightBatch":
+        """
+        Build a batch from per-record RawWeightRecord dataclasses.
+
+        Args:
+            records: List of raw weight records.
+
+        Returns:
+            Columnar batch of raw weight records.
+        """
+        return cls.from_rows([asdict(r) for r in records])
+
+    @classmethod
+    def concat(cls, batches: list["RawWeightBatch"]) -> "RawWeightBatch":
+        """
+        Concatenate multiple batches into one.
+
+        Args:
+            batches: List of batches (may be empty).
+
+        Returns:
+            Single batch containing all records in order.
+        """
+        if not batches:
+            return cls.empty()
+
+        if len(batches) == 1:
+            return batches[0]
+
+        tz = next((b.tzinfo for b in batches if b.tzinfo is not None), None)
+
+        columns = {
+            f.name: np.concatenate([getattr(b, f.name) for b in batches])
+            for f in fields(cls)
+            if f.name != "tzinfo"
+        }
 
-    model_config = ConfigDict(use_enum_values=True)
+        return cls(tzinfo=tz, **columns)
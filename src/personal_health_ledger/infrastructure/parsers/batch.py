@@ -0,0 +1,34 @@
+"""
+Per-file parse wrappers for parallel ingestion.
+
+These live at module top level so they pickle cleanly for
+ProcessPoolExecutor workers; each worker constructs its own parser
+from the (picklable) configuration objects.
+"""
+
+from pathlib import Path
+
+from personal_health_ledger.domain.weight import RawWeightBatch
+from personal_health_ledger.infrastructure.parsers.csv_parser import CSVParser
+from personal_health_ledger.infrastructure.parsers.fit_parser import FITParser
+from personal_health_ledger.utils.parameters import CSVConfig, FITConfig, ProcessingConfig
+
+
+def parse_csv_file(
+    file_path: Path,
+    drive_file_id: str,
+    csv_config: CSVConfig,
+    processing_config: ProcessingConfig,
+) -> RawWeightBatch:
+    """Parse one CSV file into a columnar batch."""
+    return CSVParser(csv_config, processing_config).parse(file_path, drive_file_id)
+
+
+def parse_fit_file(
+    file_path: Path,
+    drive_file_id: str,
+    fit_config: FITConfig,
+    processing_config: ProcessingConfig,
+) -> RawWeightBatch:
+    """Parse one FIT file into a columnar batch."""
+    return FITParser(fit_config, processing_config).parse(file_path, drive_file_id)
@@ -5,19 +5,50 @@ Provides robust CSV parsing with encoding detection, delimiter detection,
 column name normalization, and safe numeric conversion.
 """
 
+import csv
 import logging
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from personal_health_ledger.domain.weight import RawWeightRecord, SourceType
+from personal_health_ledger.domain.weight import NUMERIC_FIELDS, RawWeightBatch, SourceType
 from personal_health_ledger.utils.exceptions import ParsingError
 from personal_health_ledger.utils.parameters import CSVConfig, ProcessingConfig
 from personal_health_ledger.utils.timezone_utils import make_timezone_aware, parse_datetime
 
 logger = logging.getLogger(__name__)
 
+# Characters decoded when probing candidate encodings; BOMs and mojibake
+# surface within the first few KB, so decoding whole files is wasted I/O.
+ENCODING_PROBE_CHARS = 65_536
+
+# Files under this size skip pandas entirely: read_csv's fixed setup cost
+# dwarfs stdlib csv for a handful of rows.
+SMALL_FILE_BYTES = 64 * 1024
+
+
+def _float_from_cell(text: str | None) -> float | None:
+    """
+    Convert a csv cell to float, handling comma decimal separator.
+
+    csv.DictReader only ever yields str or None, so this skips the
+    isinstance/pd.isna dispatch a generic converter would need per cell.
+
+    Args:
+        text: Raw cell text, or None for a missing field.
+
+    Returns:
+        Float value or None if the cell is empty or unparseable.
+    """
+    if not text:
+        return None
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        return None
+
 
 class CSVParser:
     """
@@ -38,6 +69,11 @@ class CSVParser:
         self.csv_config = csv_config
         self.processing_config = processing_config
         self.column_mappings = csv_config.column_mappings
+        # Casefolded lookup so headers differing only in case or stray
+        # whitespace still map to canonical names.
+        self._column_index = {
+            key.strip().casefold(): value for key, value in self.column_mappings.items()
+        }
 
     def _detect_encoding(self, file_path: Path) -> str:
         """
@@ -52,7 +88,7 @@ class CSVParser:
         for encoding in self.csv_config.encodings:
             try:
                 with open(file_path, encoding=encoding) as f:
-                    f.read()
+                    f.read(ENCODING_PROBE_CHARS)
                 logger.debug(f"Detected encoding: {encoding}")
                 return encoding
             except (UnicodeDecodeError, LookupError):
@@ -96,9 +132,9 @@ class CSVParser:
         rename_map = {}
 
         for col in df.columns:
-            col_stripped = col.strip()
-            if col_stripped in self.column_mappings:
-                rename_map[col] = self.column_mappings[col_stripped]
+            canonical = self._column_index.get(col.strip().casefold())
+            if canonical is not None:
+                rename_map[col] = canonical
 
         if rename_map:
             df = df.rename(columns=rename_map)
@@ -106,41 +142,160 @@ class CSVParser:
 
         return df
 
-    def _safe_float_conversion(self, value: Any) -> float | None:
+    def _parse_timestamps(self, df: pd.DataFrame) -> list[Any] | None:
         """
-        Safely convert value to float, handling comma decimal separator.
+        Parse the timestamp column(s) with pandas' vectorized parser.
+
+        Rows the C parser cannot handle come back as NaT; the caller falls
+        back to the per-row dateutil path for those only.
 
         Args:
-            value: Value to convert.
+            df: DataFrame with normalized column names.
 
         Returns:
-            Float value or None if conversion fails.
+            List of timezone-aware timestamps (NaT where unparseable), or
+            None if the frame has no date/timestamp column or the column
+            defeats vectorized parsing entirely.
         """
-        if pd.isna(value):
+        if "date" in df.columns:
+            raw = df["date"].astype(str)
+            if "time" in df.columns:
+                raw = raw + " " + df["time"].astype(str)
+        elif "timestamp" in df.columns:
+            raw = df["timestamp"].astype(str)
+        else:
             return None
 
-        if isinstance(value, (int, float)):
-            return float(value)
+        try:
+            parsed = pd.to_datetime(raw, format="mixed", errors="coerce")
+
+            if parsed.dt.tz is None:
+                parsed = parsed.dt.tz_localize(
+                    self.processing_config.timezone,
+                    ambiguous="NaT",
+                    nonexistent="shift_forward",
+                )
+        except (ValueError, TypeError) as e:
+            # errors="coerce" still raises on some columns, e.g. mixed
+            # UTC offsets across a DST boundary; hand the whole file to
+            # the per-row dateutil path instead of failing it.
+            logger.debug(f"Vectorized timestamp parsing fell back to per-row: {e}")
+            return None
 
-        if isinstance(value, str):
-            value = value.strip().replace(",", ".")
-            try:
-                return float(value)
-            except ValueError:
-                return None
+        return parsed.tolist()
 
-        return None
+    def _convert_numeric_columns(self, df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """
+        Convert all canonical numeric columns to float arrays in one pass each.
 
-    def parse(self, file_path: Path, drive_file_id: str) -> list[RawWeightRecord]:
+        Handles comma decimal separators and coerces invalid cells to NaN,
+        replacing per-cell Python float conversion with vectorized column ops.
+
+        Args:
+            df: DataFrame with normalized column names.
+
+        Returns:
+            Mapping of canonical field name to float64 array (NaN for missing).
+        """
+        converted: dict[str, np.ndarray] = {}
+
+        for name in NUMERIC_FIELDS:
+            if name not in df.columns:
+                continue
+
+            series = df[name]
+            if not pd.api.types.is_numeric_dtype(series):
+                series = series.astype(str).str.strip().str.replace(",", ".", regex=False)
+
+            converted[name] = pd.to_numeric(series, errors="coerce").to_numpy(
+                dtype=np.float32
+            )
+
+        return converted
+
+    def _parse_small(
+        self, file_path: Path, drive_file_id: str, encoding: str, delimiter: str
+    ) -> RawWeightBatch:
         """
-        Parse CSV file into raw weight records.
+        Parse a small CSV with stdlib csv, skipping pandas' fixed setup cost.
 
         Args:
             file_path: Path to CSV file.
             drive_file_id: Google Drive file ID.
+            encoding: Detected file encoding.
+            delimiter: Detected delimiter.
 
         Returns:
-            List of raw weight records.
+            Columnar batch of raw weight records.
+        """
+        rows: list[dict[str, Any]] = []
+
+        with open(file_path, encoding=encoding, newline="") as f:
+            reader = csv.DictReader(f, delimiter=delimiter)
+
+            if reader.fieldnames:
+                reader.fieldnames = [
+                    self._column_index.get(name.strip().casefold(), name.strip())
+                    for name in reader.fieldnames
+                ]
+
+            has_timestamp_column = reader.fieldnames is not None and (
+                "date" in reader.fieldnames or "timestamp" in reader.fieldnames
+            )
+            if not has_timestamp_column:
+                logger.warning(
+                    f"No date/timestamp column found in {file_path.name}, skipping file"
+                )
+                return RawWeightBatch.empty()
+
+            for position, record in enumerate(reader):
+                try:
+                    if "date" in record:
+                        timestamp = parse_datetime(
+                            record.get("date") or "",
+                            record.get("time"),
+                            self.processing_config.timezone,
+                        )
+                    else:
+                        timestamp = parse_datetime(
+                            record.get("timestamp") or "",
+                            None,
+                            self.processing_config.timezone,
+                        )
+
+                    if not timestamp.tzinfo:
+                        timestamp = make_timezone_aware(
+                            timestamp, self.processing_config.timezone, assume_local=True
+                        )
+
+                    row_data: dict[str, Any] = {
+                        name: _float_from_cell(record.get(name))
+                        for name in NUMERIC_FIELDS
+                    }
+                    row_data["timestamp"] = timestamp
+                    row_data["source_file_name"] = file_path.name
+                    row_data["source_file_id"] = drive_file_id
+                    row_data["source_type"] = SourceType.CSV
+
+                    rows.append(row_data)
+
+                except Exception as e:
+                    logger.warning(f"Failed to parse row {position}: {e}")
+                    continue
+
+        logger.info(f"Parsed {len(rows)} records from {file_path.name}")
+        return RawWeightBatch.from_rows(rows)
+
+    def parse(self, file_path: Path, drive_file_id: str) -> RawWeightBatch:
+        """
+        Parse CSV file into a columnar batch of raw weight records.
+
+        Args:
+            file_path: Path to CSV file.
+            drive_file_id: Google Drive file ID.
+
+        Returns:
+            Columnar batch of raw weight records.
 
         Raises:
             ParsingError: If parsing fails.
@@ -149,64 +304,91 @@ class CSVParser:
             encoding = self._detect_encoding(file_path)
             delimiter = self._detect_delimiter(file_path, encoding)
 
-            df = pd.read_csv(file_path, encoding=encoding, sep=delimiter)
+            if file_path.stat().st_size < SMALL_FILE_BYTES:
+                return self._parse_small(file_path, drive_file_id, encoding, delimiter)
 
-            df = self._normalize_column_names(df)
+            # Arrow's CSV reader is multi-threaded and SIMD-accelerated;
+            # fall back to the default C engine for anything it rejects
+            # (unusual delimiters, encodings, malformed rows).
+            try:
+                df = pd.read_csv(
+                    file_path, encoding=encoding, sep=delimiter, engine="pyarrow"
+                )
+            except Exception as arrow_error:
+                logger.debug(f"PyArrow CSV engine fell back to C engine: {arrow_error}")
+                df = pd.read_csv(file_path, encoding=encoding, sep=delimiter)
 
-            records: list[RawWeightRecord] = []
+            df = self._normalize_column_names(df)
 
-            for idx, row in df.iterrows():
+            numeric_columns = self._convert_numeric_columns(df)
+
+            def numeric_at(name: str, position: int) -> float | None:
+                column = numeric_columns.get(name)
+                if column is None:
+                    return None
+                value = column[position]
+                return None if np.isnan(value) else float(value)
+
+            # Pull the timestamp columns out as plain Python lists once;
+            # the row loop then never touches a pandas row object
+            # (iterrows builds a Series per row).
+            if "date" in df.columns:
+                date_values = df["date"].astype(str).tolist()
+                time_values = (
+                    df["time"].astype(str).tolist() if "time" in df.columns else None
+                )
+            elif "timestamp" in df.columns:
+                date_values = df["timestamp"].astype(str).tolist()
+                time_values = None
+            else:
+                logger.warning(
+                    f"No date/timestamp column found in {file_path.name}, skipping file"
+                )
+                date_values = []
+                time_values = None
+
+            parsed_timestamps = self._parse_timestamps(df)
+            rows: list[dict[str, Any]] = []
+
+            for position, date_str in enumerate(date_values):
                 try:
-                    if "date" in df.columns:
-                        date_str = str(row.get("date", ""))
-                        time_str = str(row.get("time", "")) if "time" in df.columns else None
-                        timestamp = parse_datetime(
-                            date_str, time_str, self.processing_config.timezone
+                    vectorized_ts = (
+                        parsed_timestamps[position]
+                        if parsed_timestamps is not None
+                        else None
+                    )
+
+                    if vectorized_ts is not None and not pd.isna(vectorized_ts):
+                        timestamp = vectorized_ts.to_pydatetime()
+                    else:
+                        time_str = (
+                            time_values[position] if time_values is not None else None
                         )
-                    elif "timestamp" in df.columns:
                         timestamp = parse_datetime(
-                            str(row["timestamp"]), None, self.processing_config.timezone
+                            date_str, time_str, self.processing_config.timezone
                         )
-                    else:
-                        logger.warning(f"Row {idx}: No date/timestamp column found, skipping")
-                        continue
 
                     if not timestamp.tzinfo:
                         timestamp = make_timezone_aware(
                             timestamp, self.processing_config.timezone, assume_local=True
                         )
 
-                    record = RawWeightRecord(
-                        timestamp=timestamp,
-                        weight_kg=self._safe_float_conversion(row.get("weight_kg")),
-                        body_fat_pct=self._safe_float_conversion(row.get("body_fat_pct")),
-                        fat_mass_kg=self._safe_float_conversion(row.get("fat_mass_kg")),
-                        fat_free_pct=self._safe_float_conversion(row.get("fat_free_pct")),
-                        fat_free_mass_kg=self._safe_float_conversion(row.get("fat_free_mass_kg")),
-                        skeletal_muscle_pct=self._safe_float_conversion(
-                            row.get("skeletal_muscle_pct")
-                        ),
-                        skeletal_muscle_mass_kg=self._safe_float_conversion(
-                            row.get("skeletal_muscle_mass_kg")
-                        ),
-                        muscle_pct=self._safe_float_conversion(row.get("muscle_pct")),
-                        muscle_mass_kg=self._safe_float_conversion(row.get("muscle_mass_kg")),
-                        bone_mass_kg=self._safe_float_conversion(row.get("bone_mass_kg")),
-                        body_water=self._safe_float_conversion(row.get("body_water")),
-                        bmr_kcal=self._safe_float_conversion(row.get("bmr_kcal")),
-                        source_file_name=file_path.name,
-                        source_file_id=drive_file_id,
-                        source_type=SourceType.CSV,
-                    )
+                    row_data: dict[str, Any] = {
+                        name: numeric_at(name, position) for name in NUMERIC_FIELDS
+                    }
+                    row_data["timestamp"] = timestamp
+                    row_data["source_file_name"] = file_path.name
+                    row_data["source_file_id"] = drive_file_id
+                    row_data["source_type"] = SourceType.CSV
 
-                    records.append(record)
+                    rows.append(row_data)
 
                 except Exception as e:
-                    logger.warning(f"Failed to parse row {idx}: {e}")
+                    logger.warning(f"Failed to parse row {position}: {e}")
                     continue
 
-            logger.info(f"Parsed {len(records)} records from {file_path.name}")
-            return records
+            logger.info(f"Parsed {len(rows)} records from {file_path.name}")
+            return RawWeightBatch.from_rows(rows)
 
         except Exception as e:
             raise ParsingError(f"Failed to parse CSV file {file_path}: {e}") from e
@@ -5,12 +5,13 @@ Provides FIT file parsing using fitparse library.
 """
 
 import logging
+import mmap
 from pathlib import Path
 from typing import Any
 
 from fitparse import FitFile
 
-from personal_health_ledger.domain.weight import RawWeightRecord, SourceType
+from personal_health_ledger.domain.weight import NUMERIC_FIELDS, RawWeightBatch, SourceType
 from personal_health_ledger.utils.exceptions import ParsingError
 from personal_health_ledger.utils.parameters import FITConfig, ProcessingConfig
 from personal_health_ledger.utils.timezone_utils import make_timezone_aware
@@ -18,6 +19,11 @@ from personal_health_ledger.utils.timezone_utils import make_timezone_aware
 logger = logging.getLogger(__name__)
 
 
+def _safe_float(val: Any) -> float | None:
+    """Convert a FIT field value to float, passing None through."""
+    return float(val) if val is not None else None
+
+
 class FITParser:
     """
     Parser for FIT weight data files.
@@ -35,85 +41,101 @@ class FITParser:
         """
         self.fit_config = fit_config
         self.processing_config = processing_config
+        # fit-field -> canonical-field lookup so each record is mapped in
+        # the same pass that reads its fields.
+        self._field_map = dict(fit_config.field_mappings)
 
-    def parse(self, file_path: Path, drive_file_id: str) -> list[RawWeightRecord]:
+    def parse(self, file_path: Path, drive_file_id: str) -> RawWeightBatch:
         """
-        Parse FIT file into raw weight records.
+        Parse FIT file into a columnar batch of raw weight records.
 
         Args:
             file_path: Path to FIT file.
             drive_file_id: Google Drive file ID.
 
         Returns:
-            List of raw weight records.
+            Columnar batch of raw weight records.
 
         Raises:
             ParsingError: If parsing fails.
         """
         try:
-            fitfile = FitFile(str(file_path))
-            records: list[RawWeightRecord] = []
-
-            for message_type in self.fit_config.message_types:
-                for record_data in fitfile.get_messages(message_type):
-                    try:
-                        data_dict = {}
-                        for field in record_data:
-                            data_dict[field.name] = field.value
-
-                        timestamp = data_dict.get("timestamp")
-                        if not timestamp:
-                            logger.warning("No timestamp in FIT record, skipping")
-                            continue
-
-                        if not timestamp.tzinfo:
-                            timestamp = make_timezone_aware(
-                                timestamp, self.processing_config.timezone, assume_local=True
-                            )
-
-                        # Map FIT fields to canonical fields using field_mappings
-                        mapped_data = {}
-                        for fit_field, canonical_field in self.fit_config.field_mappings.items():
-                            if fit_field in data_dict and data_dict[fit_field] is not None:
-                                mapped_data[canonical_field] = data_dict[fit_field]
-
-                        # Weight is required
-                        if "weight_kg" not in mapped_data:
-                            logger.warning("No weight in FIT record, skipping")
-                            continue
-
-                        def safe_float(val: Any) -> float | None:
-                            return float(val) if val is not None else None
-
-                        record = RawWeightRecord(
-                            timestamp=timestamp,
-                            weight_kg=safe_float(mapped_data.get("weight_kg")),
-                            body_fat_pct=safe_float(mapped_data.get("body_fat_pct")),
-                            fat_mass_kg=safe_float(mapped_data.get("fat_mass_kg")),
-                            fat_free_pct=safe_float(mapped_data.get("fat_free_pct")),
-                            fat_free_mass_kg=safe_float(mapped_data.get("fat_free_mass_kg")),
-                            skeletal_muscle_pct=safe_float(mapped_data.get("skeletal_muscle_pct")),
-                            skeletal_muscle_mass_kg=safe_float(mapped_data.get("skeletal_muscle_mass_kg")),
-                            muscle_pct=safe_float(mapped_data.get("muscle_pct")),
-                            muscle_mass_kg=safe_float(mapped_data.get("muscle_mass_kg")),
-                            bone_mass_kg=safe_float(mapped_data.get("bone_mass_kg")),
-                            body_water=safe_float(mapped_data.get("body_water")),
-                            bmr_kcal=safe_float(mapped_data.get("bmr_kcal")),
-                            metabolic_age=safe_float(mapped_data.get("metabolic_age")),
-                            visceral_fat_rating=safe_float(mapped_data.get("visceral_fat_rating")),
-                            source_file_name=file_path.name,
-                            source_file_id=drive_file_id,
-                            source_type=SourceType.FIT,
-                        )
+            # Memory-map the file instead of letting fitparse slurp it into
+            # a bytes object: pages load on demand and are shared across
+            # parse-pool processes mapping the same file.
+            with open(file_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                fitfile = FitFile(mapped)
+                rows = self._extract_rows(fitfile, file_path, drive_file_id)
+
+            logger.info(f"Parsed {len(rows)} records from {file_path.name}")
+            return RawWeightBatch.from_rows(rows)
+
+        except Exception as e:
+            raise ParsingError(f"Failed to parse FIT file {file_path}: {e}") from e
 
-                        records.append(record)
+    def _extract_rows(
+        self, fitfile: FitFile, file_path: Path, drive_file_id: str
+    ) -> list[dict[str, Any]]:
+        """
+        Extract canonical row dictionaries from an opened FIT file.
 
-                    except Exception as e:
-                        logger.warning(f"Failed to parse FIT record: {e}")
+        Args:
+            fitfile: Parsed FIT file handle.
+            file_path: Path to the FIT file (for lineage).
+            drive_file_id: Google Drive file ID (for lineage).
+
+        Returns:
+            List of row dictionaries for RawWeightBatch.from_rows.
+        """
+        rows: list[dict[str, Any]] = []
+
+        for message_type in self.fit_config.message_types:
+            for record_data in fitfile.get_messages(message_type):
+                try:
+                    # Single pass over the record's fields: pick out the
+                    # timestamp and map everything else straight to
+                    # canonical names.
+                    timestamp = None
+                    mapped_data: dict[str, Any] = {}
+
+                    for field in record_data:
+                        name = field.name
+                        if name == "timestamp":
+                            timestamp = field.value
+                        elif field.value is not None:
+                            canonical_field = self._field_map.get(name)
+                            if canonical_field is not None:
+                                mapped_data[canonical_field] = field.value
+
+                    if not timestamp:
+                        logger.warning("No timestamp in FIT record, skipping")
                         continue
 
-            logger.info(f"Parsed {len(records)} records from {file_path.name}")
-            return records
+                    if not timestamp.tzinfo:
+                        timestamp = make_timezone_aware(
+                            timestamp, self.processing_config.timezone, assume_local=True
+                        )
 
-        except Exception as e:
-            raise ParsingError(f"Failed to parse FIT file {file_path}: {e}") from e
+                    # Weight is required
+                    if "weight_kg" not in mapped_data:
+                        logger.warning("No weight in FIT record, skipping")
+                        continue
+
+                    row: dict[str, Any] = {
+                        name: _safe_float(mapped_data.get(name))
+                        for name in NUMERIC_FIELDS
+                    }
+                    row["timestamp"] = timestamp
+                    row["source_file_name"] = file_path.name
+                    row["source_file_id"] = drive_file_id
+                    row["source_type"] = SourceType.FIT
+
+                    rows.append(row)
+
+                except Exception as e:
+                    logger.warning(f"Failed to parse FIT record: {e}")
+                    continue
+
+        return rows
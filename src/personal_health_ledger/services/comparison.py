@@ -5,20 +5,61 @@ Provides detailed comparison reports for CSV and FIT file pairs.
 """
 
 import logging
-from collections import defaultdict
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from personal_health_ledger.domain.weight import RawWeightRecord
+import numpy as np
+
+from personal_health_ledger.domain.weight import RawWeightBatch, RawWeightRecord
 from personal_health_ledger.utils.parameters import ProcessingConfig
-from personal_health_ledger.utils.timezone_utils import timestamps_match
+from personal_health_ledger.utils.timezone_utils import ns_to_datetime
 
 logger = logging.getLogger(__name__)
 
+# Matches "<anything> <m>-<yyyy> ..." file names, e.g.
+# "Peso 1-2024 Huawei Health.csv".
+_MONTH_YEAR_RE = re.compile(r"^\S+\s+(\d{1,2})-(\d{4})\b")
+
+def _iso(dt: datetime | None) -> str | None:
+    """Format an optional timestamp as ISO-8601 (None stays None)."""
+    return dt.isoformat() if dt else None
+
+
+# Fields compared between matched CSV/FIT records; weight_kg must stay
+# first so the MAE column lines up.
+COMPARED_FIELDS = (
+    "weight_kg",
+    "body_fat_pct",
+    "fat_mass_kg",
+    "fat_free_pct",
+    "fat_free_mass_kg",
+)
+
 
 class ComparisonResult:
     """Results of comparing CSV and FIT file pair."""
 
+    __slots__ = (
+        "csv_file_name",
+        "fit_file_name",
+        "csv_drive_id",
+        "fit_drive_id",
+        "csv_only_count",
+        "fit_only_count",
+        "both_count",
+        "mismatches",
+        "csv_min_timestamp",
+        "csv_max_timestamp",
+        "fit_min_timestamp",
+        "fit_max_timestamp",
+        "weight_mae",
+    )
+
     def __init__(
         self,
         csv_file_name: str,
@@ -43,7 +84,9 @@ class ComparisonResult:
         self.csv_only_count = 0
         self.fit_only_count = 0
         self.both_count = 0
-        self.mismatches: dict[str, int] = defaultdict(int)
+        # Counter updates skip defaultdict's per-miss factory call; only
+        # fields with at least one mismatch ever get a key.
+        self.mismatches: Counter[str] = Counter()
 
         self.csv_min_timestamp: datetime | None = None
         self.csv_max_timestamp: datetime | None = None
@@ -64,12 +107,12 @@ class ComparisonResult:
             "both_count": self.both_count,
             "mismatches": dict(self.mismatches),
             "csv_timestamp_range": {
-                "min": self.csv_min_timestamp.isoformat() if self.csv_min_timestamp else None,
-                "max": self.csv_max_timestamp.isoformat() if self.csv_max_timestamp else None,
+                "min": _iso(self.csv_min_timestamp),
+                "max": _iso(self.csv_max_timestamp),
             },
             "fit_timestamp_range": {
-                "min": self.fit_min_timestamp.isoformat() if self.fit_min_timestamp else None,
-                "max": self.fit_max_timestamp.isoformat() if self.fit_max_timestamp else None,
+                "min": _iso(self.fit_min_timestamp),
+                "max": _iso(self.fit_max_timestamp),
             },
             "weight_mae": self.weight_mae,
         }
@@ -91,54 +134,51 @@ class ComparisonService:
         """
         self.config = config
 
-    def _extract_month_year(self, filename: str) -> tuple[int, int] | None:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_month_year(filename: str) -> tuple[int, int] | None:
         """
         Extract month and year from filename.
 
         Expected pattern: "Peso <m>-<yyyy> Huawei Health.(csv|fit)"
 
+        Cached per filename: pair-finding probes the same names from
+        several dicts, and corpora reuse names across runs.
+
         Args:
             filename: File name to parse.
 
         Returns:
             Tuple of (month, year) or None if parsing fails.
         """
-        try:
-            parts = filename.split()
-            if len(parts) < 2:
-                return None
-
-            date_part = parts[1]
-            month_str, year_str = date_part.split("-")
-            month = int(month_str)
-            year = int(year_str)
-
-            return (month, year)
-
-        except Exception as e:
-            logger.debug(f"Failed to extract month/year from {filename}: {e}")
+        match = _MONTH_YEAR_RE.match(filename)
+        if match is None:
+            logger.debug(f"Failed to extract month/year from {filename}")
             return None
 
+        return (int(match.group(1)), int(match.group(2)))
+
     def _find_file_pairs(
-        self, csv_records: list[RawWeightRecord], fit_records: list[RawWeightRecord]
-    ) -> list[tuple[list[RawWeightRecord], list[RawWeightRecord]]]:
+        self, csv_batch: RawWeightBatch, fit_batch: RawWeightBatch
+    ) -> list[tuple[list[int], list[int]]]:
         """
         Find matching CSV and FIT file pairs.
 
         Args:
-            csv_records: All CSV records.
-            fit_records: All FIT records.
+            csv_batch: Columnar batch of all CSV records.
+            fit_batch: Columnar batch of all FIT records.
 
         Returns:
-            List of (csv_records, fit_records) pairs.
+            List of (csv_indices, fit_indices) pairs, indexing into the
+            respective batches.
         """
-        csv_by_file: dict[str, list[RawWeightRecord]] = defaultdict(list)
-        for record in csv_records:
-            csv_by_file[record.source_file_name].append(record)
+        csv_by_file: dict[str, list[int]] = defaultdict(list)
+        for i in range(len(csv_batch)):
+            csv_by_file[csv_batch.source_file_name[i]].append(i)
 
-        fit_by_file: dict[str, list[RawWeightRecord]] = defaultdict(list)
-        for record in fit_records:
-            fit_by_file[record.source_file_name].append(record)
+        fit_by_file: dict[str, list[int]] = defaultdict(list)
+        for i in range(len(fit_batch)):
+            fit_by_file[fit_batch.source_file_name[i]].append(i)
 
         csv_by_month_year: dict[tuple[int, int], str] = {}
         for csv_file in csv_by_file.keys():
@@ -152,133 +192,214 @@ class ComparisonService:
             if month_year:
                 fit_by_month_year[month_year] = fit_file
 
-        pairs: list[tuple[list[RawWeightRecord], list[RawWeightRecord]]] = []
+        # Pair and track paired files in the same pass instead of
+        # rebuilding the pairing condition in two set comprehensions.
+        pairs: list[tuple[list[int], list[int]]] = []
+        paired_csv_files: set[str] = set()
+        paired_fit_files: set[str] = set()
 
         for month_year, csv_file in csv_by_month_year.items():
-            if month_year in fit_by_month_year:
-                fit_file = fit_by_month_year[month_year]
-                pairs.append((csv_by_file[csv_file], fit_by_file[fit_file]))
-
-        # Track which files have been paired
-        paired_csv_files = {csv_file for month_year, csv_file in csv_by_month_year.items()
-                           if month_year in fit_by_month_year}
-        paired_fit_files = {fit_by_month_year[month_year] for month_year, csv_file in csv_by_month_year.items()
-                           if month_year in fit_by_month_year}
+            matched_fit_file = fit_by_month_year.get(month_year)
+            if matched_fit_file is not None:
+                pairs.append((csv_by_file[csv_file], fit_by_file[matched_fit_file]))
+                paired_csv_files.add(csv_file)
+                paired_fit_files.add(matched_fit_file)
 
         # Add unpaired FIT files
-        for fit_file in fit_by_file.keys():
+        for fit_file, fit_file_indices in fit_by_file.items():
             if fit_file not in paired_fit_files:
-                pairs.append(([], fit_by_file[fit_file]))
+                pairs.append(([], fit_file_indices))
 
         # Add unpaired CSV files
-        for csv_file in csv_by_file.keys():
+        for csv_file, csv_file_indices in csv_by_file.items():
             if csv_file not in paired_csv_files:
-                pairs.append((csv_by_file[csv_file], []))
+                pairs.append((csv_file_indices, []))
 
         return pairs
 
     def _compare_pair(
-        self, csv_records: list[RawWeightRecord], fit_records: list[RawWeightRecord]
+        self,
+        csv_batch: RawWeightBatch,
+        fit_batch: RawWeightBatch,
+        csv_indices: list[int],
+        fit_indices: list[int],
     ) -> ComparisonResult:
         """
-        Compare a pair of CSV and FIT records.
+        Compare a pair of CSV and FIT files.
 
         Args:
-            csv_records: Records from CSV file.
-            fit_records: Records from FIT file.
+            csv_batch: Columnar batch of all CSV records.
+            fit_batch: Columnar batch of all FIT records.
+            csv_indices: Row indices of the CSV file within csv_batch.
+            fit_indices: Row indices of the FIT file within fit_batch.
 
         Returns:
             Comparison result.
         """
-        csv_file_name = csv_records[0].source_file_name if csv_records else "N/A"
-        fit_file_name = fit_records[0].source_file_name if fit_records else "N/A"
-        csv_drive_id = csv_records[0].source_file_id if csv_records else "N/A"
-        fit_drive_id = fit_records[0].source_file_id if fit_records else "N/A"
+        csv_file_name = csv_batch.source_file_name[csv_indices[0]] if csv_indices else "N/A"
+        fit_file_name = fit_batch.source_file_name[fit_indices[0]] if fit_indices else "N/A"
+        csv_drive_id = csv_batch.source_file_id[csv_indices[0]] if csv_indices else "N/A"
+        fit_drive_id = fit_batch.source_file_id[fit_indices[0]] if fit_indices else "N/A"
 
         result = ComparisonResult(csv_file_name, fit_file_name, csv_drive_id, fit_drive_id)
 
-        if csv_records:
-            csv_timestamps = [r.timestamp for r in csv_records]
-            result.csv_min_timestamp = min(csv_timestamps)
-            result.csv_max_timestamp = max(csv_timestamps)
-
-        if fit_records:
-            fit_timestamps = [r.timestamp for r in fit_records]
-            result.fit_min_timestamp = min(fit_timestamps)
-            result.fit_max_timestamp = max(fit_timestamps)
-
-        matched_fit_indices: set[int] = set()
-
-        weight_differences: list[float] = []
-
-        for csv_record in csv_records:
-            matched = False
-
-            for fit_idx, fit_record in enumerate(fit_records):
-                if timestamps_match(
-                    csv_record.timestamp,
-                    fit_record.timestamp,
-                    self.config.timestamp_tolerance_seconds,
-                ):
-                    matched = True
-                    matched_fit_indices.add(fit_idx)
-                    result.both_count += 1
-
-                    if csv_record.weight_kg and fit_record.weight_kg:
-                        diff = abs(csv_record.weight_kg - fit_record.weight_kg)
-                        weight_differences.append(diff)
-
-                        if diff > self.config.numeric_tolerance:
-                            result.mismatches["weight_kg"] += 1
-
-                    for field in [
-                        "body_fat_pct",
-                        "fat_mass_kg",
-                        "fat_free_pct",
-                        "fat_free_mass_kg",
-                    ]:
-                        csv_val = getattr(csv_record, field)
-                        fit_val = getattr(fit_record, field)
+        csv_ts_ns = csv_batch.timestamp_ns
+        fit_ts_ns = fit_batch.timestamp_ns
+
+        tolerance_ns = self.config.timestamp_tolerance_seconds * 1_000_000_000
+
+        # Sort both sides by timestamp once and walk them in lockstep:
+        # matching drops from O(N*M) to O((N+M) log (N+M)) and needs no
+        # matched-index set.
+        csv_sorted = sorted(csv_indices, key=lambda i: csv_ts_ns[i])
+        fit_sorted = sorted(fit_indices, key=lambda i: fit_ts_ns[i])
+        csv_sorted_ts = [int(csv_ts_ns[i]) for i in csv_sorted]
+        fit_sorted_ts = [int(fit_ts_ns[i]) for i in fit_sorted]
+
+        # Sorted order makes the range endpoints free.
+        if csv_sorted_ts:
+            result.csv_min_timestamp = ns_to_datetime(csv_sorted_ts[0], csv_batch.tzinfo)
+            result.csv_max_timestamp = ns_to_datetime(csv_sorted_ts[-1], csv_batch.tzinfo)
+
+        if fit_sorted_ts:
+            result.fit_min_timestamp = ns_to_datetime(fit_sorted_ts[0], fit_batch.tzinfo)
+            result.fit_max_timestamp = ns_to_datetime(fit_sorted_ts[-1], fit_batch.tzinfo)
+
+        matched_csv: list[int] = []
+        matched_fit: list[int] = []
+
+        i = 0
+        j = 0
+        while i < len(csv_sorted) and j < len(fit_sorted):
+            delta = csv_sorted_ts[i] - fit_sorted_ts[j]
+
+            if abs(delta) <= tolerance_ns:
+                matched_csv.append(csv_sorted[i])
+                matched_fit.append(fit_sorted[j])
+                i += 1
+                j += 1
+            elif delta < 0:
+                result.csv_only_count += 1
+                i += 1
+            else:
+                result.fit_only_count += 1
+                j += 1
 
-                        if csv_val is not None and fit_val is not None:
-                            if abs(csv_val - fit_val) > self.config.numeric_tolerance:
-                                result.mismatches[field] += 1
+        result.csv_only_count += len(csv_sorted) - i
+        result.fit_only_count += len(fit_sorted) - j
+        result.both_count = len(matched_csv)
 
-                    break
+        if matched_csv:
+            self._tally_field_mismatches(
+                result, csv_batch, fit_batch, matched_csv, matched_fit
+            )
 
-            if not matched:
-                result.csv_only_count += 1
+        return result
 
-        for fit_idx in range(len(fit_records)):
-            if fit_idx not in matched_fit_indices:
-                result.fit_only_count += 1
+    def _tally_field_mismatches(
+        self,
+        result: ComparisonResult,
+        csv_batch: RawWeightBatch,
+        fit_batch: RawWeightBatch,
+        matched_csv: list[int],
+        matched_fit: list[int],
+    ) -> None:
+        """
+        Tally per-field mismatches and weight MAE for matched record pairs.
 
-        if weight_differences:
-            result.weight_mae = sum(weight_differences) / len(weight_differences)
+        Stacks the matched rows into two float matrices and compares all
+        fields at once, replacing a per-pair Python loop over field names.
 
-        return result
+        Args:
+            result: Comparison result to update in place.
+            csv_batch: Columnar batch of all CSV records.
+            fit_batch: Columnar batch of all FIT records.
+            matched_csv: Batch indices of matched CSV records.
+            matched_fit: Batch indices of matched FIT records, parallel
+                to matched_csv.
+        """
+        csv_rows = np.asarray(matched_csv)
+        fit_rows = np.asarray(matched_fit)
+
+        csv_matrix = np.column_stack(
+            [getattr(csv_batch, field)[csv_rows] for field in COMPARED_FIELDS]
+        )
+        fit_matrix = np.column_stack(
+            [getattr(fit_batch, field)[fit_rows] for field in COMPARED_FIELDS]
+        )
+
+        # NaN (missing on either side) never exceeds the tolerance, so
+        # absent values drop out of the counts for free.
+        diff = np.abs(csv_matrix - fit_matrix)
+        mismatch_mask = diff > self.config.numeric_tolerance
+
+        # Weight keeps its historical guard: zero or missing weight on
+        # either side is excluded from both the mismatch count and MAE.
+        weight_valid = (
+            ~np.isnan(diff[:, 0])
+            & (csv_matrix[:, 0] != 0.0)
+            & (fit_matrix[:, 0] != 0.0)
+        )
+        mismatch_mask[:, 0] &= weight_valid
+
+        counts = mismatch_mask.sum(axis=0)
+        for field, count in zip(COMPARED_FIELDS, counts, strict=True):
+            if count:
+                result.mismatches[field] += int(count)
+
+        if weight_valid.any():
+            result.weight_mae = float(diff[:, 0][weight_valid].mean())
 
     def compare(
-        self, csv_records: list[RawWeightRecord], fit_records: list[RawWeightRecord]
+        self,
+        csv_records: RawWeightBatch | list[RawWeightRecord],
+        fit_records: RawWeightBatch | list[RawWeightRecord],
     ) -> list[ComparisonResult]:
         """
         Compare CSV and FIT records across all file pairs.
 
         Args:
-            csv_records: All CSV records.
-            fit_records: All FIT records.
+            csv_records: Columnar batch (or list of raw records) from CSV files.
+            fit_records: Columnar batch (or list of raw records) from FIT files.
 
         Returns:
             List of comparison results, one per file pair.
         """
-        logger.info(f"Comparing {len(csv_records)} CSV and {len(fit_records)} FIT records")
-
-        pairs = self._find_file_pairs(csv_records, fit_records)
-        results: list[ComparisonResult] = []
-
-        for csv_recs, fit_recs in pairs:
-            result = self._compare_pair(csv_recs, fit_recs)
-            results.append(result)
+        csv_batch = (
+            csv_records
+            if isinstance(csv_records, RawWeightBatch)
+            else RawWeightBatch.from_records(csv_records)
+        )
+        fit_batch = (
+            fit_records
+            if isinstance(fit_records, RawWeightBatch)
+            else RawWeightBatch.from_records(fit_records)
+        )
+
+        logger.info(f"Comparing {len(csv_batch)} CSV and {len(fit_batch)} FIT records")
+
+        pairs = self._find_file_pairs(csv_batch, fit_batch)
+
+        # Pairs are independent and the heavy lifting is vectorized
+        # NumPy (which releases the GIL), so a thread pool scales them
+        # without pickling the batches into worker processes.
+        if len(pairs) < 2:
+            results = [
+                self._compare_pair(csv_batch, fit_batch, csv_indices, fit_indices)
+                for csv_indices, fit_indices in pairs
+            ]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(pairs))
+            ) as executor:
+                results = list(
+                    executor.map(
+                        lambda pair: self._compare_pair(
+                            csv_batch, fit_batch, pair[0], pair[1]
+                        ),
+                        pairs,
+                    )
+                )
 
         logger.info(f"Compared {len(results)} file pairs")
         return results
@@ -7,27 +7,54 @@ and generation of consolidated datasets with full lineage tracking.
 
 import logging
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import cast
+
+import numpy as np
 
 from personal_health_ledger.domain.weight import (
+    NUMERIC_FIELDS,
+    SOURCE_TYPE_TO_CODE,
     FieldSource,
+    RawWeightBatch,
     RawWeightRecord,
     SourceType,
     WeightMeasurement,
 )
 from personal_health_ledger.utils.exceptions import ConsolidationError
-from personal_health_ledger.utils.hashing import generate_record_id
+from personal_health_ledger.utils.hashing import generate_record_ids_bulk
 from personal_health_ledger.utils.parameters import ProcessingConfig
-from personal_health_ledger.utils.timezone_utils import timestamps_match
+from personal_health_ledger.utils.timezone_utils import ns_to_datetime
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class ConsolidationResult:
+    """
+    Result of a consolidation run.
+
+    Carries the consolidated measurements together with the conflict
+    subset collected during merging, so callers never re-scan the full
+    measurement list just to count or write conflicts.
+    """
+
+    measurements: list[WeightMeasurement]
+    conflicts: list[WeightMeasurement]
+
+    @property
+    def conflicts_count(self) -> int:
+        """Number of measurements with at least one conflicting field."""
+        return len(self.conflicts)
+
+
 class ConsolidationService:
     """
     Service for consolidating weight measurements from multiple sources.
 
     Merges CSV and FIT data, detects conflicts, and maintains full data lineage.
+    Operates on columnar batches to avoid per-record object overhead.
     """
 
     def __init__(self, config: ProcessingConfig) -> None:
@@ -38,213 +65,231 @@ class ConsolidationService:
             config: Processing configuration.
         """
         self.config = config
+        # Conflict preferences are fixed per service; resolve the
+        # per-field dict lookups once instead of per record pair.
+        field_preferences = config.conflict_resolution.field_preferences
+        default_preference = config.conflict_resolution.default_preference
+        self._prefer_fit = np.array(
+            [
+                field_preferences.get(name, default_preference) == "fit"
+                for name in NUMERIC_FIELDS
+            ],
+            dtype=bool,
+        )
 
-    def _find_matching_records(
-        self,
-        records: list[RawWeightRecord],
-        tolerance_seconds: int,
-    ) -> dict[tuple[datetime, SourceType], list[RawWeightRecord]]:
+    @staticmethod
+    def _merge_single_side(
+        data: dict[str, float | None],
+        source: FieldSource,
+    ) -> tuple[dict[str, float | None], dict[str, FieldSource]]:
         """
-        Group records by timestamp and source type.
+        Fast path for groups with only one source: no conflicts possible.
 
         Args:
-            records: List of raw weight records.
-            tolerance_seconds: Timestamp matching tolerance.
+            data: Numeric field values from the sole source.
+            source: FieldSource label for present values.
 
         Returns:
-            Dictionary mapping (timestamp, source_type) to list of records.
+            Tuple of (merged values by field, field source by field).
         """
-        grouped: dict[tuple[datetime, SourceType], list[RawWeightRecord]] = defaultdict(list)
+        merged_values: dict[str, float | None] = {}
+        field_sources: dict[str, FieldSource] = {}
 
-        for record in records:
-            grouped[(record.timestamp, record.source_type)].append(record)
+        for name in NUMERIC_FIELDS:
+            value = data[name]
+            merged_values[name] = value
+            field_sources[name] = source if value is not None else FieldSource.MERGED
 
-        return grouped
+        return merged_values, field_sources
 
-    def _merge_field(
+    def _merge_fields(
         self,
-        csv_value: float | None,
-        fit_value: float | None,
-        field_name: str,
-    ) -> tuple[float | None, FieldSource, bool]:
+        csv_data: dict[str, float | None] | None,
+        fit_data: dict[str, float | None] | None,
+    ) -> tuple[dict[str, float | None], dict[str, FieldSource]]:
         """
-        Merge a single field from CSV and FIT sources.
+        Merge all numeric fields of a CSV/FIT record pair in one pass.
+
+        Packs both sides into NaN-sentinel arrays and derives the merged
+        values and source labels from vectorized masks, replacing a
+        per-field branch ladder.
 
         Args:
-            csv_value: Value from CSV.
-            fit_value: Value from FIT.
-            field_name: Name of the field.
+            csv_data: Numeric field values from CSV, or None if absent.
+            fit_data: Numeric field values from FIT, or None if absent.
 
         Returns:
-            Tuple of (merged_value, field_source, is_conflict).
+            Tuple of (merged values by field, field source by field).
         """
-        if csv_value is None and fit_value is None:
-            return None, FieldSource.MERGED, False
+        csv_arr = np.array(
+            [
+                np.nan if csv_data is None or csv_data[name] is None else csv_data[name]
+                for name in NUMERIC_FIELDS
+            ],
+            dtype=np.float64,
+        )
+        fit_arr = np.array(
+            [
+                np.nan if fit_data is None or fit_data[name] is None else fit_data[name]
+                for name in NUMERIC_FIELDS
+            ],
+            dtype=np.float64,
+        )
+
+        csv_missing = np.isnan(csv_arr)
+        fit_missing = np.isnan(fit_arr)
+        both_present = ~csv_missing & ~fit_missing
+        conflict = both_present & (
+            np.abs(csv_arr - fit_arr) > self.config.numeric_tolerance
+        )
 
-        if csv_value is None:
-            return fit_value, FieldSource.FIT, False
+        # CSV wins wherever both sides agree or the preference says so;
+        # FIT fills CSV gaps and overrides conflicts it is preferred for.
+        merged = np.where(csv_missing, fit_arr, csv_arr)
+        merged = np.where(conflict & self._prefer_fit, fit_arr, merged)
 
-        if fit_value is None:
-            return csv_value, FieldSource.CSV, False
+        merged_values: dict[str, float | None] = {}
+        field_sources: dict[str, FieldSource] = {}
 
-        if abs(csv_value - fit_value) <= self.config.numeric_tolerance:
-            return csv_value, FieldSource.MERGED, False
+        for position, name in enumerate(NUMERIC_FIELDS):
+            value = merged[position]
+            merged_values[name] = None if np.isnan(value) else float(value)
 
-        preference = self.config.conflict_resolution.field_preferences.get(
-            field_name, self.config.conflict_resolution.default_preference
-        )
+            if conflict[position]:
+                field_sources[name] = FieldSource.CONFLICT
+            elif csv_missing[position] and not fit_missing[position]:
+                field_sources[name] = FieldSource.FIT
+            elif fit_missing[position] and not csv_missing[position]:
+                field_sources[name] = FieldSource.CSV
+            else:
+                field_sources[name] = FieldSource.MERGED
 
-        if preference == "csv":
-            return csv_value, FieldSource.CONFLICT, True
-        elif preference == "fit":
-            return fit_value, FieldSource.CONFLICT, True
-        else:
-            return csv_value, FieldSource.CONFLICT, True
+        return merged_values, field_sources
 
-    def _merge_records(
+    def _conflict_matrix(
         self,
-        csv_records: list[RawWeightRecord],
-        fit_records: list[RawWeightRecord],
-    ) -> WeightMeasurement:
+        batch: RawWeightBatch,
+        groups: list[tuple[list[int], list[int]]],
+    ) -> np.ndarray:
         """
-        Merge CSV and FIT records into a single consolidated measurement.
+        Detect CSV-vs-FIT conflicts for all merge groups in one vectorized pass.
 
         Args:
-            csv_records: Records from CSV source.
-            fit_records: Records from FIT source.
+            batch: Columnar batch containing the rows.
+            groups: List of (csv_indices, fit_indices) merge groups.
 
         Returns:
-            Consolidated weight measurement with lineage.
+            Boolean array of shape (len(groups), len(NUMERIC_FIELDS)) where
+            True marks a field whose CSV and FIT values disagree beyond the
+            numeric tolerance.
         """
-        all_records = csv_records + fit_records
+        n_fields = len(NUMERIC_FIELDS)
 
-        timestamp = all_records[0].timestamp
-        source_files = [r.source_file_name for r in all_records]
-        drive_file_ids = [r.source_file_id for r in all_records]
-        source_types: set[SourceType] = {r.source_type for r in all_records}
+        if not groups:
+            return np.zeros((0, n_fields), dtype=bool)
 
-        csv_data = csv_records[0] if csv_records else None
-        fit_data = fit_records[0] if fit_records else None
+        field_matrix = np.column_stack([getattr(batch, name) for name in NUMERIC_FIELDS])
 
-        field_sources: dict[str, FieldSource] = {}
-        conflicting_fields: list[str] = []
+        csv_first = np.array([g[0][0] if g[0] else -1 for g in groups], dtype=np.int64)
+        fit_first = np.array([g[1][0] if g[1] else -1 for g in groups], dtype=np.int64)
 
-        weight_kg, field_sources["weight_kg"], is_conflict = self._merge_field(
-            csv_data.weight_kg if csv_data else None,
-            fit_data.weight_kg if fit_data else None,
-            "weight_kg",
-        )
-        if is_conflict:
-            conflicting_fields.append("weight_kg")
-
-        body_fat_pct, field_sources["body_fat_pct"], is_conflict = self._merge_field(
-            csv_data.body_fat_pct if csv_data else None,
-            fit_data.body_fat_pct if fit_data else None,
-            "body_fat_pct",
-        )
-        if is_conflict:
-            conflicting_fields.append("body_fat_pct")
+        csv_values = np.full((len(groups), n_fields), np.nan, dtype=np.float32)
+        fit_values = np.full((len(groups), n_fields), np.nan, dtype=np.float32)
 
-        fat_mass_kg, field_sources["fat_mass_kg"], _ = self._merge_field(
-            csv_data.fat_mass_kg if csv_data else None,
-            fit_data.fat_mass_kg if fit_data else None,
-            "fat_mass_kg",
-        )
+        csv_present = csv_first >= 0
+        fit_present = fit_first >= 0
+        csv_values[csv_present] = field_matrix[csv_first[csv_present]]
+        fit_values[fit_present] = field_matrix[fit_first[fit_present]]
 
-        fat_free_pct, field_sources["fat_free_pct"], _ = self._merge_field(
-            csv_data.fat_free_pct if csv_data else None,
-            fit_data.fat_free_pct if fit_data else None,
-            "fat_free_pct",
+        agree = np.isclose(
+            csv_values,
+            fit_values,
+            rtol=0.0,
+            atol=self.config.numeric_tolerance,
+            equal_nan=True,
         )
 
-        fat_free_mass_kg, field_sources["fat_free_mass_kg"], _ = self._merge_field(
-            csv_data.fat_free_mass_kg if csv_data else None,
-            fit_data.fat_free_mass_kg if fit_data else None,
-            "fat_free_mass_kg",
-        )
-
-        skeletal_muscle_pct, field_sources["skeletal_muscle_pct"], _ = self._merge_field(
-            csv_data.skeletal_muscle_pct if csv_data else None,
-            fit_data.skeletal_muscle_pct if fit_data else None,
-            "skeletal_muscle_pct",
-        )
+        return ~(agree | np.isnan(csv_values) | np.isnan(fit_values))
 
-        skeletal_muscle_mass_kg, field_sources["skeletal_muscle_mass_kg"], _ = self._merge_field(
-            csv_data.skeletal_muscle_mass_kg if csv_data else None,
-            fit_data.skeletal_muscle_mass_kg if fit_data else None,
-            "skeletal_muscle_mass_kg",
-        )
-
-        muscle_pct, field_sources["muscle_pct"], _ = self._merge_field(
-            csv_data.muscle_pct if csv_data else None,
-            fit_data.muscle_pct if fit_data else None,
-            "muscle_pct",
-        )
-
-        muscle_mass_kg, field_sources["muscle_mass_kg"], _ = self._merge_field(
-            csv_data.muscle_mass_kg if csv_data else None,
-            fit_data.muscle_mass_kg if fit_data else None,
-            "muscle_mass_kg",
-        )
-
-        bone_mass_kg, field_sources["bone_mass_kg"], _ = self._merge_field(
-            csv_data.bone_mass_kg if csv_data else None,
-            fit_data.bone_mass_kg if fit_data else None,
-            "bone_mass_kg",
-        )
+    def _merge_records(
+        self,
+        batch: RawWeightBatch,
+        csv_indices: list[int],
+        fit_indices: list[int],
+        conflict_row: np.ndarray,
+        ingestion_ts: datetime | None = None,
+    ) -> WeightMeasurement:
+        """
+        Merge CSV and FIT rows of a batch into a single consolidated measurement.
 
-        body_water, field_sources["body_water"], _ = self._merge_field(
-            csv_data.body_water if csv_data else None,
-            fit_data.body_water if fit_data else None,
-            "body_water",
-        )
+        Args:
+            batch: Columnar batch containing the rows.
+            csv_indices: Row indices from the CSV source.
+            fit_indices: Row indices from the FIT source.
+            conflict_row: Boolean conflict flags for this group, one per
+                entry in NUMERIC_FIELDS.
+            ingestion_ts: Shared ingestion timestamp for the run;
+                computed here if not given.
 
-        bmr_kcal, field_sources["bmr_kcal"], _ = self._merge_field(
-            csv_data.bmr_kcal if csv_data else None,
-            fit_data.bmr_kcal if fit_data else None,
-            "bmr_kcal",
+        Returns:
+            Consolidated weight measurement with lineage.
+        """
+        first_index = (csv_indices or fit_indices)[0]
+        timestamp = ns_to_datetime(int(batch.timestamp_ns[first_index]), batch.tzinfo)
+
+        # Walk the two index lists directly rather than concatenating
+        # them just to iterate the copy.
+        source_files = [batch.source_file_name[i] for i in csv_indices]
+        source_files.extend(batch.source_file_name[i] for i in fit_indices)
+        drive_file_ids = [batch.source_file_id[i] for i in csv_indices]
+        drive_file_ids.extend(batch.source_file_id[i] for i in fit_indices)
+        source_types: set[SourceType] = {batch.source_type_at(i) for i in csv_indices}
+        source_types.update(batch.source_type_at(i) for i in fit_indices)
+
+        csv_data = (
+            {name: batch.numeric_value(name, csv_indices[0]) for name in NUMERIC_FIELDS}
+            if csv_indices
+            else None
         )
-
-        metabolic_age, field_sources["metabolic_age"], _ = self._merge_field(
-            csv_data.metabolic_age if csv_data else None,
-            fit_data.metabolic_age if fit_data else None,
-            "metabolic_age",
+        fit_data = (
+            {name: batch.numeric_value(name, fit_indices[0]) for name in NUMERIC_FIELDS}
+            if fit_indices
+            else None
         )
 
-        visceral_fat_rating, field_sources["visceral_fat_rating"], _ = self._merge_field(
-            csv_data.visceral_fat_rating if csv_data else None,
-            fit_data.visceral_fat_rating if fit_data else None,
-            "visceral_fat_rating",
-        )
+        conflicting_fields: list[str] = [
+            name
+            for name, flagged in zip(NUMERIC_FIELDS, conflict_row, strict=True)
+            if flagged
+        ]
+
+        if csv_data is None:
+            if fit_data is None:
+                raise ConsolidationError("Cannot merge a group with no records")
+            merged_values, field_sources = self._merge_single_side(
+                fit_data, FieldSource.FIT
+            )
+        elif fit_data is None:
+            merged_values, field_sources = self._merge_single_side(
+                csv_data, FieldSource.CSV
+            )
+        else:
+            merged_values, field_sources = self._merge_fields(csv_data, fit_data)
 
+        weight_kg = merged_values["weight_kg"]
         if weight_kg is None:
             raise ConsolidationError("Cannot consolidate record without weight_kg")
 
-        record_id = generate_record_id(
-            timestamp, weight_kg, source_types, self.config.record_id
-        )
-
+        # Record IDs are assigned in bulk by consolidate() once all
+        # groups are merged.
         measurement = WeightMeasurement(
-            record_id=record_id,
+            record_id="",
             timestamp=timestamp,
-            weight_kg=weight_kg,
-            body_fat_pct=body_fat_pct,
-            fat_mass_kg=fat_mass_kg,
-            fat_free_pct=fat_free_pct,
-            fat_free_mass_kg=fat_free_mass_kg,
-            skeletal_muscle_pct=skeletal_muscle_pct,
-            skeletal_muscle_mass_kg=skeletal_muscle_mass_kg,
-            muscle_pct=muscle_pct,
-            muscle_mass_kg=muscle_mass_kg,
-            bone_mass_kg=bone_mass_kg,
-            body_water=body_water,
-            bmr_kcal=bmr_kcal,
-            metabolic_age=metabolic_age,
-            visceral_fat_rating=visceral_fat_rating,
+            **merged_values,
             source_files=source_files,
             source_types=source_types,
             drive_file_ids=drive_file_ids,
-            ingestion_timestamp=datetime.now(timezone.utc),
+            ingestion_timestamp=ingestion_ts or datetime.now(timezone.utc),
             field_sources=field_sources,
             conflicting_fields=conflicting_fields,
             chosen_source=None,
@@ -256,66 +301,120 @@ class ConsolidationService:
 
         if conflicting_fields:
             if "weight_kg" in conflicting_fields:
-                measurement.weight_kg_csv = csv_data.weight_kg if csv_data else None
-                measurement.weight_kg_fit = fit_data.weight_kg if fit_data else None
+                measurement.weight_kg_csv = csv_data["weight_kg"] if csv_data else None
+                measurement.weight_kg_fit = fit_data["weight_kg"] if fit_data else None
             if "body_fat_pct" in conflicting_fields:
-                measurement.body_fat_pct_csv = csv_data.body_fat_pct if csv_data else None
-                measurement.body_fat_pct_fit = fit_data.body_fat_pct if fit_data else None
+                measurement.body_fat_pct_csv = csv_data["body_fat_pct"] if csv_data else None
+                measurement.body_fat_pct_fit = fit_data["body_fat_pct"] if fit_data else None
 
         return measurement
 
-    def consolidate(self, raw_records: list[RawWeightRecord]) -> list[WeightMeasurement]:
+    def consolidate(
+        self, raw_records: RawWeightBatch | list[RawWeightRecord]
+    ) -> ConsolidationResult:
         """
         Consolidate raw records into canonical measurements.
 
         Args:
-            raw_records: List of raw weight records from all sources.
+            raw_records: Columnar batch (or list of raw weight records)
+                from all sources.
 
         Returns:
-            List of consolidated weight measurements with lineage.
+            Consolidation result with measurements and their conflict subset.
 
         Raises:
             ConsolidationError: If consolidation fails.
         """
         try:
-            csv_records = [r for r in raw_records if r.source_type == SourceType.CSV]
-            fit_records = [r for r in raw_records if r.source_type == SourceType.FIT]
-
-            logger.info(f"Consolidating {len(csv_records)} CSV and {len(fit_records)} FIT records")
-
-            csv_by_timestamp: dict[datetime, list[RawWeightRecord]] = defaultdict(list)
-            for record in csv_records:
-                csv_by_timestamp[record.timestamp].append(record)
-
-            fit_by_timestamp: dict[datetime, list[RawWeightRecord]] = defaultdict(list)
-            for record in fit_records:
-                fit_by_timestamp[record.timestamp].append(record)
-
-            consolidated: list[WeightMeasurement] = []
-            matched_fit_timestamps: set[datetime] = set()
-
-            for csv_ts, csv_recs in csv_by_timestamp.items():
-                matched_fit_recs: list[RawWeightRecord] = []
-
-                for fit_ts, fit_recs in fit_by_timestamp.items():
-                    if timestamps_match(
-                        csv_ts, fit_ts, self.config.timestamp_tolerance_seconds
-                    ):
-                        matched_fit_recs.extend(fit_recs)
-                        matched_fit_timestamps.add(fit_ts)
-
-                measurement = self._merge_records(csv_recs, matched_fit_recs)
-                consolidated.append(measurement)
-
-            for fit_ts, fit_recs in fit_by_timestamp.items():
-                if fit_ts not in matched_fit_timestamps:
-                    measurement = self._merge_records([], fit_recs)
-                    consolidated.append(measurement)
+            batch = (
+                raw_records
+                if isinstance(raw_records, RawWeightBatch)
+                else RawWeightBatch.from_records(raw_records)
+            )
+
+            ts_ns = batch.timestamp_ns
+            is_csv = batch.source_type == SOURCE_TYPE_TO_CODE[SourceType.CSV]
+            csv_count = int(np.count_nonzero(is_csv))
+
+            logger.info(
+                f"Consolidating {csv_count} CSV and {len(batch) - csv_count} FIT records"
+            )
+
+            csv_by_timestamp: dict[int, list[int]] = defaultdict(list)
+            fit_by_timestamp: dict[int, list[int]] = defaultdict(list)
+
+            for i in range(len(batch)):
+                if is_csv[i]:
+                    csv_by_timestamp[int(ts_ns[i])].append(i)
+                else:
+                    fit_by_timestamp[int(ts_ns[i])].append(i)
+
+            tolerance_ns = self.config.timestamp_tolerance_seconds * 1_000_000_000
+
+            # Merge-join the sorted unique timestamps: the FIT window for
+            # every CSV timestamp comes from two binary searches run as
+            # C kernels, so Python only walks actual matches.
+            csv_ts_sorted = sorted(csv_by_timestamp)
+            fit_ts_sorted = sorted(fit_by_timestamp)
+            fit_ts_arr = np.array(fit_ts_sorted, dtype=np.int64)
+            csv_ts_arr = np.array(csv_ts_sorted, dtype=np.int64)
+
+            window_starts = np.searchsorted(
+                fit_ts_arr, csv_ts_arr - tolerance_ns, side="left"
+            )
+            window_ends = np.searchsorted(
+                fit_ts_arr, csv_ts_arr + tolerance_ns, side="right"
+            )
+
+            fit_matched = np.zeros(len(fit_ts_sorted), dtype=bool)
+            groups: list[tuple[list[int], list[int]]] = []
+
+            for csv_ts, start, end in zip(
+                csv_ts_sorted, window_starts, window_ends, strict=True
+            ):
+                matched_fit_indices: list[int] = []
+                for j in range(start, end):
+                    matched_fit_indices.extend(fit_by_timestamp[fit_ts_sorted[j]])
+                fit_matched[start:end] = True
+
+                groups.append((csv_by_timestamp[csv_ts], matched_fit_indices))
+
+            for leftover in np.flatnonzero(~fit_matched):
+                groups.append(([], fit_by_timestamp[fit_ts_sorted[leftover]]))
+
+            conflict_matrix = self._conflict_matrix(batch, groups)
+
+            # One shared ingestion timestamp per run: cheaper than a
+            # clock read per measurement and deterministic within a batch.
+            ingestion_ts = datetime.now(timezone.utc)
+
+            consolidated = [
+                self._merge_records(
+                    batch, csv_indices, fit_indices, conflict_matrix[row], ingestion_ts
+                )
+                for row, (csv_indices, fit_indices) in enumerate(groups)
+            ]
 
             consolidated.sort(key=lambda m: m.timestamp)
 
-            logger.info(f"Consolidated to {len(consolidated)} measurements")
-            return consolidated
+            # weight_kg is guaranteed non-None: _merge_records raises for
+            # any group that would consolidate without one.
+            record_ids = generate_record_ids_bulk(
+                [m.timestamp for m in consolidated],
+                cast("list[float]", [m.weight_kg for m in consolidated]),
+                [m.source_types for m in consolidated],
+                self.config.record_id,
+            )
+            for measurement, record_id in zip(consolidated, record_ids, strict=True):
+                measurement.record_id = record_id
+
+            conflicts = [m for m in consolidated if m.conflicting_fields]
+
+            logger.info(
+                f"Consolidated to {len(consolidated)} measurements "
+                f"({len(conflicts)} with conflicts)"
+            )
+            return ConsolidationResult(measurements=consolidated, conflicts=conflicts)
 
         except Exception as e:
             raise ConsolidationError(f"Consolidation failed: {e}") from e
@@ -5,115 +5,283 @@ Consolidates measurements by day, computing averages for numeric fields.
 """
 
 import logging
-from datetime import date
 from pathlib import Path
+from typing import cast
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pandas.io.parsers import TextFileReader
 
+from personal_health_ledger.domain.weight import NUMERIC_FIELDS
 from personal_health_ledger.utils.exceptions import ConsolidationError
 
 logger = logging.getLogger(__name__)
 
+# CSVs at least this large are read in chunks so peak memory stays
+# proportional to the number of days, not the number of records.
+LARGE_CSV_BYTES = 32 * 1024 * 1024
+
+# Rows per chunk when streaming a large CSV.
+CHUNK_ROWS = 200_000
+
 
 class DailyConsolidationService:
     """
     Service for consolidating measurements by day.
-    
+
     For each day, computes the average of all non-null numeric values.
     """
 
+    @staticmethod
+    def _source_types_per_day(df: pd.DataFrame) -> pd.Series:
+        """
+        Collect unique source types per day with vectorized string ops.
+
+        The column holds either JSON array strings (CSV input) or list
+        cells (Parquet input); both are exploded to one type per row and
+        deduplicated per day without per-cell json.loads.
+
+        Args:
+            df: Frame with 'date' and 'source_types' columns.
+
+        Returns:
+            Series indexed by date with comma-joined sorted type names;
+            days whose rows carry no types are absent.
+        """
+        raw = df['source_types']
+        non_null = raw.dropna()
+
+        if not non_null.empty and isinstance(non_null.iloc[0], str):
+            parts = (
+                cast('pd.Series[str]', raw.fillna('[]'))
+                .str.strip('[]')
+                .str.replace('"', '', regex=False)
+                .str.split(',')
+            )
+            # explode() yields one string per row, though the stubs keep
+            # the pre-explode list element type.
+            exploded = cast('pd.Series[str]', parts.explode()).str.strip()
+            exploded = exploded[exploded != '']
+        else:
+            exploded = raw.explode().dropna().astype(str)
+
+        return cast(
+            'pd.Series[str]',
+            exploded.to_frame('source_type')
+            .assign(date=df['date'])
+            .drop_duplicates()
+            .sort_values('source_type')
+            .groupby('date')['source_type']
+            .agg(','.join),
+        )
+
+    def _aggregate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate an in-memory frame into daily averages plus metadata.
+
+        Args:
+            df: Frame with 'timestamp', numeric columns, and optionally
+                'source_types'.
+
+        Returns:
+            Frame indexed by day with averaged numeric columns,
+            record_count, and (if present) source_types.
+        """
+        # Truncate to the day while staying in datetime64: grouping on
+        # datetime64 keys is faster than on per-row Python date objects.
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['date'] = df['timestamp'].dt.normalize()
+
+        numeric_cols = [col for col in NUMERIC_FIELDS if col in df.columns]
+
+        # One GroupBy object hashes the date column once; the count
+        # and source-type aggregations reuse its grouping and align
+        # on the same index, so no merge calls are needed.
+        grouped = df.groupby('date', sort=True)
+
+        daily_agg = grouped[numeric_cols].mean()
+
+        # Add metadata: count of records per day and source types
+        daily_agg['record_count'] = grouped.size()
+
+        if 'source_types' in df.columns:
+            daily_agg['source_types'] = self._source_types_per_day(df)
+            daily_agg['source_types'] = daily_agg['source_types'].fillna('')
+
+        return daily_agg
+
+    def _aggregate_chunks(self, reader: TextFileReader) -> tuple[pd.DataFrame, int]:
+        """
+        Aggregate a chunked CSV reader into daily averages plus metadata.
+
+        Each chunk is reduced to per-day sums and non-null counts, so
+        only O(days) partial aggregates are held instead of the whole
+        frame; the final mean is sum / count per day and column.
+
+        Args:
+            reader: Chunked reader over the consolidated CSV.
+
+        Returns:
+            Tuple of (aggregated frame indexed by day, total row count).
+        """
+        sum_parts: list[pd.DataFrame] = []
+        count_parts: list[pd.DataFrame] = []
+        size_parts: list[pd.Series] = []
+        type_parts: list[pd.Series] = []
+        total_rows = 0
+
+        for chunk in reader:
+            total_rows += len(chunk)
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+            chunk['date'] = chunk['timestamp'].dt.normalize()
+
+            numeric_cols = [col for col in NUMERIC_FIELDS if col in chunk.columns]
+            grouped = chunk.groupby('date')
+
+            sum_parts.append(grouped[numeric_cols].sum())
+            count_parts.append(grouped[numeric_cols].count())
+            size_parts.append(grouped.size())
+            if 'source_types' in chunk.columns:
+                type_parts.append(self._source_types_per_day(chunk))
+
+        if total_rows == 0:
+            return pd.DataFrame(), 0
+
+        total_sum = pd.concat(sum_parts).groupby(level=0).sum()
+        total_count = pd.concat(count_parts).groupby(level=0).sum()
+
+        daily_agg = (total_sum / total_count).sort_index()
+        daily_agg['record_count'] = pd.concat(size_parts).groupby(level=0).sum()
+
+        if type_parts:
+            combined = cast(
+                'pd.Series[str]',
+                pd.concat(type_parts).groupby(level=0).agg(','.join),
+            )
+            # Every cell came out of ','.join above, so no NA reaches the
+            # lambda despite what the split stubs allow.
+            daily_agg['source_types'] = combined.str.split(',').map(
+                lambda parts: ','.join(sorted(set(cast('list[str]', parts))))
+            )
+            daily_agg['source_types'] = daily_agg['source_types'].fillna('')
+
+        return daily_agg, total_rows
+
     def consolidate_by_day(self, input_file: Path, output_file: Path) -> None:
         """
         Consolidate measurements by day.
-        
+
         Args:
             input_file: Path to input consolidated CSV file.
             output_file: Path to output daily consolidated CSV file.
-            
+
         Raises:
             ConsolidationError: If consolidation fails.
         """
         try:
-            logger.info(f"Reading consolidated data from {input_file}")
-            df = pd.read_csv(input_file)
-            
-            if df.empty:
-                logger.warning("Input file is empty")
-                return
-            
-            # Parse timestamp and extract date
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['date'] = df['timestamp'].dt.date
-            
-            # Define numeric columns to average
-            numeric_cols = [
-                'weight_kg',
-                'body_fat_pct',
-                'fat_mass_kg',
-                'fat_free_pct',
-                'fat_free_mass_kg',
-                'skeletal_muscle_pct',
-                'skeletal_muscle_mass_kg',
-                'muscle_pct',
-                'muscle_mass_kg',
-                'bone_mass_kg',
-                'body_water',
-                'bmr_kcal',
-                'metabolic_age',
-                'visceral_fat_rating',
-            ]
-            
-            # Filter only columns that exist in the dataframe
-            numeric_cols = [col for col in numeric_cols if col in df.columns]
-            
-            # Group by date and compute averages for numeric columns
-            logger.info(f"Consolidating {len(df)} records into daily averages")
-            
-            daily_agg = df.groupby('date')[numeric_cols].mean().reset_index()
-            
-            # Add metadata: count of records per day and source types
-            record_counts = df.groupby('date').size().reset_index(name='record_count')
-            daily_agg = daily_agg.merge(record_counts, on='date')
-            
-            # Collect unique source types per day
-            def collect_source_types(series: pd.Series) -> list[str]:
-                """Collect all unique source types from a series of JSON strings."""
-                import json
-                types: set[str] = set()
-                for val in series:
-                    if pd.notna(val):
-                        try:
-                            types.update(json.loads(val))
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                return sorted(list(types))
-            
-            if 'source_types' in df.columns:
-                source_types_per_day = df.groupby('date')['source_types'].apply(
-                    collect_source_types
-                ).reset_index()
-                source_types_per_day['source_types'] = source_types_per_day['source_types'].apply(
-                    lambda x: ','.join(x) if x else ''
-                )
-                daily_agg = daily_agg.merge(source_types_per_day, on='date')
-            
-            # Sort by date
-            daily_agg = daily_agg.sort_values('date')
-            
+            # Project only the columns the aggregation needs; the lineage
+            # columns (source_files, field_sources, ...) are wide JSON
+            # strings that would dominate parse time.
+            wanted = {'timestamp', 'source_types', *NUMERIC_FIELDS}
+
+            # Prefer the Parquet sibling written alongside the CSV: the
+            # internal build -> daily hop then skips CSV string parsing.
+            # Only when it is at least as fresh as the named CSV, though —
+            # a stale Parquet must not shadow the input the caller asked for.
+            parquet_file = input_file.with_suffix('.parquet')
+            use_parquet = parquet_file.exists() and (
+                not input_file.exists()
+                or parquet_file.stat().st_mtime_ns >= input_file.stat().st_mtime_ns
+            )
+            if use_parquet:
+                logger.info(f"Reading consolidated data from {parquet_file}")
+                schema_names = pq.read_schema(parquet_file).names
+                df = pq.read_table(
+                    parquet_file,
+                    columns=[c for c in schema_names if c in wanted],
+                ).to_pandas()
+
+                if df.empty:
+                    logger.warning("Input file is empty")
+                    return
+
+                logger.info(f"Consolidating {len(df)} records into daily averages")
+                total_records = len(df)
+                daily_agg = self._aggregate_frame(df)
+            else:
+                logger.info(f"Reading consolidated data from {input_file}")
+                # Resolve the projection from the header first: the
+                # multi-threaded pyarrow engine takes a column list but
+                # not a callable.
+                header = pd.read_csv(input_file, nrows=0)
+                usecols = [c for c in header.columns if c in wanted]
+
+                if input_file.stat().st_size >= LARGE_CSV_BYTES:
+                    # Stream big files: only per-day partial aggregates
+                    # are kept in memory (the pyarrow engine cannot
+                    # chunk, so this path uses the C engine).
+                    reader = pd.read_csv(
+                        input_file, usecols=usecols, chunksize=CHUNK_ROWS
+                    )
+                    daily_agg, total_records = self._aggregate_chunks(reader)
+
+                    if total_records == 0:
+                        logger.warning("Input file is empty")
+                        return
+                else:
+                    try:
+                        # Arrow's multi-threaded reader, called directly so
+                        # timestamps stay raw strings: pandas' pyarrow
+                        # engine converts tz-aware values to UTC, which
+                        # would shift late-evening measurements into the
+                        # next UTC day. The strings are parsed downstream
+                        # exactly as on the C-engine and chunked paths.
+                        df = pacsv.read_csv(
+                            input_file,
+                            convert_options=pacsv.ConvertOptions(
+                                include_columns=usecols,
+                                column_types={'timestamp': pa.string()},
+                            ),
+                        ).to_pandas()
+                    except Exception as arrow_error:
+                        logger.debug(
+                            f"PyArrow CSV reader fell back to pandas: {arrow_error}"
+                        )
+                        df = pd.read_csv(input_file, usecols=usecols)
+
+                    if df.empty:
+                        logger.warning("Input file is empty")
+                        return
+
+                    logger.info(
+                        f"Consolidating {len(df)} records into daily averages"
+                    )
+                    total_records = len(df)
+                    daily_agg = self._aggregate_frame(df)
+
+            # Grouping already sorted by date; materialize plain dates
+            # only for the aggregated rows so the CSV keeps its
+            # YYYY-MM-DD date column.
+            daily_agg = daily_agg.reset_index()
+            daily_agg['date'] = daily_agg['date'].dt.date
+
             # Round numeric values to reasonable precision
-            for col in numeric_cols:
+            for col in NUMERIC_FIELDS:
                 if col in daily_agg.columns:
                     daily_agg[col] = daily_agg[col].round(2)
-            
+
             # Save to output file
             output_file.parent.mkdir(parents=True, exist_ok=True)
             daily_agg.to_csv(output_file, index=False)
-            
+
             logger.info(
-                f"Consolidated {len(df)} records into {len(daily_agg)} daily averages"
+                f"Consolidated {total_records} records into "
+                f"{len(daily_agg)} daily averages"
             )
             logger.info(f"Wrote daily consolidated data to {output_file}")
-            
+
         except Exception as e:
             raise ConsolidationError(
                 f"Failed to consolidate by day: {e}"
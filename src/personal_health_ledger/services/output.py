@@ -6,17 +6,60 @@ Handles CSV, Parquet, and JSON output with proper lineage serialization.
 
 import json
 import logging
+from datetime import datetime
+from enum import Enum
 from pathlib import Path
 from typing import Any
 
-import pandas as pd
-
-from personal_health_ledger.domain.weight import WeightMeasurement
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a listed dependency
+    orjson = None  # type: ignore[assignment]
+
+from personal_health_ledger.domain.weight import (
+    NUMERIC_FIELDS,
+    WeightMeasurement,
+    cached_json_dict,
+    cached_json_list,
+)
 from personal_health_ledger.services.comparison import ComparisonResult
 from personal_health_ledger.utils.parameters import OutputConfig
 
 logger = logging.getLogger(__name__)
 
+# Rows per Parquet row group; large enough to amortize per-group metadata,
+# small enough to keep write buffering bounded.
+ROW_GROUP_SIZE = 65_536
+
+# Quote only cells that need it (commas, quotes, newlines), matching the
+# minimal-quoting CSVs this pipeline has always produced.
+_CSV_WRITE_OPTIONS = pacsv.WriteOptions(quoting_style="needed")
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    JSON fallback for the known non-native types in output payloads.
+
+    Explicit dispatch instead of default=str: datetimes get isoformat
+    rather than str()'s space-separated form, enums their value, and sets
+    a stable sorted list; anything truly unknown raises instead of being
+    silently stringified.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 class OutputService:
     """
@@ -36,6 +79,46 @@ class OutputService:
         self.output_dir = Path(config.dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def write_all(self, measurements: list[WeightMeasurement]) -> None:
+        """
+        Write consolidated outputs and the conflicts file in one pass.
+
+        Builds the CSV-shaped Arrow table once and feeds both the
+        consolidated CSV and the conflicts CSV from it (conflict rows are
+        selected with a vectorized filter), instead of re-walking the
+        measurement list per output file.
+
+        Args:
+            measurements: List of consolidated weight measurements.
+        """
+        if not measurements:
+            logger.warning("No measurements to write")
+            return
+
+        table = self._measurements_to_csv_table(measurements)
+
+        if "csv" in self.config.formats:
+            csv_path = self.output_dir / self.config.files.consolidated_csv
+            pacsv.write_csv(table, csv_path, _CSV_WRITE_OPTIONS)
+            logger.info(f"Wrote CSV to {csv_path}")
+
+        if "parquet" in self.config.formats:
+            self._write_parquet(measurements)
+
+        logger.info(f"Wrote {len(measurements)} measurements to output")
+
+        # Conflict rows carry a non-empty conflicting_fields JSON cell.
+        conflict_rows = table.filter(
+            pc.not_equal(table["conflicting_fields"], "[]")  # pyright: ignore[reportAttributeAccessIssue]
+        )
+        if conflict_rows.num_rows == 0:
+            logger.info("No conflicts to write")
+            return
+
+        conflicts_path = self.output_dir / self.config.files.conflicts
+        pacsv.write_csv(conflict_rows, conflicts_path, _CSV_WRITE_OPTIONS)
+        logger.info(f"Wrote {conflict_rows.num_rows} conflicts to {conflicts_path}")
+
     def write_consolidated_data(self, measurements: list[WeightMeasurement]) -> None:
         """
         Write consolidated measurements to CSV and/or Parquet.
@@ -64,53 +147,172 @@ class OutputService:
         """
         csv_path = self.output_dir / self.config.files.consolidated_csv
 
-        data = [m.to_dict(for_csv=True) for m in measurements]
-        df = pd.DataFrame(data)
-
-        df.to_csv(csv_path, index=False, encoding="utf-8")
+        pacsv.write_csv(
+            self._measurements_to_csv_table(measurements), csv_path, _CSV_WRITE_OPTIONS
+        )
         logger.info(f"Wrote CSV to {csv_path}")
 
+    def _measurements_to_csv_table(  # pyright: ignore[reportUnknownParameterType]
+        self, measurements: list[WeightMeasurement]
+    ) -> pa.Table:
+        """
+        Build a PyArrow table shaped for CSV output.
+
+        Mirrors to_dict(for_csv=True) semantics: complex lineage columns are
+        pre-serialized to JSON strings (through the same memoized encoders)
+        and timestamps to ISO strings, but column by column instead of one
+        dict per row.
+
+        Args:
+            measurements: List of measurements.
+
+        Returns:
+            Arrow table with string/float32 columns matching the CSV schema.
+        """
+        columns: dict[str, pa.Array] = {
+            "record_id": pa.array([m.record_id for m in measurements], type=pa.string()),
+            "timestamp": pa.array(
+                [m.timestamp.isoformat() for m in measurements], type=pa.string()
+            ),
+        }
+
+        # Batches carry float32 readings; keeping the narrow type here means
+        # Arrow renders the shortest float32 repr (75.1, not the float64
+        # upcast noise 75.0999984741211).
+        for name in NUMERIC_FIELDS:
+            columns[name] = pa.array(
+                [getattr(m, name) for m in measurements], type=pa.float32()
+            )
+
+        columns["source_files"] = pa.array(
+            [cached_json_list(tuple(m.source_files)) for m in measurements],
+            type=pa.string(),
+        )
+        columns["source_types"] = pa.array(
+            [cached_json_list(tuple(sorted(m.source_types))) for m in measurements],
+            type=pa.string(),
+        )
+        columns["drive_file_ids"] = pa.array(
+            [cached_json_list(tuple(m.drive_file_ids)) for m in measurements],
+            type=pa.string(),
+        )
+        columns["ingestion_timestamp"] = pa.array(
+            [m.ingestion_timestamp.isoformat() for m in measurements], type=pa.string()
+        )
+        columns["field_sources"] = pa.array(
+            [
+                cached_json_dict(tuple(sorted(m.field_sources.items())))
+                for m in measurements
+            ],
+            type=pa.string(),
+        )
+        columns["conflicting_fields"] = pa.array(
+            [cached_json_list(tuple(m.conflicting_fields)) for m in measurements],
+            type=pa.string(),
+        )
+        columns["chosen_source"] = pa.array(
+            [m.chosen_source for m in measurements], type=pa.string()
+        )
+
+        for name in ("weight_kg_csv", "weight_kg_fit", "body_fat_pct_csv", "body_fat_pct_fit"):
+            columns[name] = pa.array(
+                [getattr(m, name) for m in measurements], type=pa.float32()
+            )
+
+        return pa.table(columns)
+
+    def _measurements_to_table(  # pyright: ignore[reportUnknownParameterType]
+        self, measurements: list[WeightMeasurement]
+    ) -> pa.Table:
+        """
+        Build a PyArrow table from measurements without per-row dict/JSON encoding.
+
+        Args:
+            measurements: List of measurements.
+
+        Returns:
+            Columnar Arrow table with lineage columns as native list/map types.
+        """
+        columns: dict[str, pa.Array] = {
+            "record_id": pa.array([m.record_id for m in measurements], type=pa.string()),
+            "timestamp": pa.array([m.timestamp for m in measurements]),
+        }
+
+        for name in NUMERIC_FIELDS:
+            columns[name] = pa.array(
+                [getattr(m, name) for m in measurements], type=pa.float64()
+            )
+
+        columns["source_files"] = pa.array(
+            [m.source_files for m in measurements], type=pa.list_(pa.string())
+        )
+        columns["source_types"] = pa.array(
+            [sorted(m.source_types) for m in measurements], type=pa.list_(pa.string())
+        )
+        columns["drive_file_ids"] = pa.array(
+            [m.drive_file_ids for m in measurements], type=pa.list_(pa.string())
+        )
+        columns["ingestion_timestamp"] = pa.array(
+            [m.ingestion_timestamp for m in measurements]
+        )
+        columns["field_sources"] = pa.array(
+            [list(m.field_sources.items()) for m in measurements],
+            type=pa.map_(pa.string(), pa.string()),
+        )
+        columns["conflicting_fields"] = pa.array(
+            [m.conflicting_fields for m in measurements], type=pa.list_(pa.string())
+        )
+        columns["chosen_source"] = pa.array(
+            [m.chosen_source for m in measurements], type=pa.string()
+        )
+
+        for name in ("weight_kg_csv", "weight_kg_fit", "body_fat_pct_csv", "body_fat_pct_fit"):
+            columns[name] = pa.array(
+                [getattr(m, name) for m in measurements], type=pa.float64()
+            )
+
+        return pa.table(columns)
+
     def _write_parquet(self, measurements: list[WeightMeasurement]) -> None:
         """
-        Write measurements to Parquet file.
+        Write measurements to Parquet file in row-group-sized batches.
 
         Args:
             measurements: List of measurements.
         """
         parquet_path = self.output_dir / self.config.files.consolidated_parquet
 
-        data = [m.to_dict(for_csv=False) for m in measurements]
-        df = pd.DataFrame(data)
+        table = self._measurements_to_table(measurements)
 
-        df["source_types"] = df["source_types"].apply(lambda x: list(x) if x else [])
+        codec = self.config.parquet.compression
+        # Snappy (and lz4) have no level knob; passing one makes Arrow raise.
+        level = self.config.parquet.level if codec in ("zstd", "gzip", "brotli") else None
+
+        with pq.ParquetWriter(
+            parquet_path, table.schema, compression=codec, compression_level=level
+        ) as writer:
+            for batch in table.to_batches(max_chunksize=ROW_GROUP_SIZE):
+                writer.write_batch(batch)
 
-        df.to_parquet(  # type: ignore[call-overload]
-            parquet_path,
-            engine=self.config.parquet.engine,
-            compression=self.config.parquet.compression,
-            index=False,
-        )
         logger.info(f"Wrote Parquet to {parquet_path}")
 
-    def write_conflicts(self, measurements: list[WeightMeasurement]) -> None:
+    def write_conflicts(self, conflicts: list[WeightMeasurement]) -> None:
         """
         Write records with conflicts to separate CSV file.
 
         Args:
-            measurements: List of all measurements.
+            conflicts: Measurements with at least one conflicting field
+                (as collected by ConsolidationService).
         """
-        conflicts = [m for m in measurements if m.conflicting_fields]
-
         if not conflicts:
             logger.info("No conflicts to write")
             return
 
         conflicts_path = self.output_dir / self.config.files.conflicts
 
-        data = [m.to_dict(for_csv=True) for m in conflicts]
-        df = pd.DataFrame(data)
-
-        df.to_csv(conflicts_path, index=False, encoding="utf-8")
+        pacsv.write_csv(
+            self._measurements_to_csv_table(conflicts), conflicts_path, _CSV_WRITE_OPTIONS
+        )
         logger.info(f"Wrote {len(conflicts)} conflicts to {conflicts_path}")
 
     def write_comparison_summary(self, results: list[ComparisonResult]) -> None:
@@ -127,8 +329,15 @@ class OutputService:
             "pairs": [r.to_dict() for r in results],
         }
 
-        with open(summary_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, default=str)
+        # Serialize through orjson's C encoder and land the payload in
+        # one write call; stdlib json is the fallback.
+        if orjson is not None:
+            summary_path.write_bytes(
+                orjson.dumps(summary, option=orjson.OPT_INDENT_2, default=_json_default)
+            )
+        else:
+            with open(summary_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, default=_json_default)
 
         logger.info(f"Wrote comparison summary to {summary_path}")
 
@@ -141,8 +350,17 @@ class OutputService:
         """
         log_path = self.output_dir / self.config.files.ingestion_log
 
-        with open(log_path, "w", encoding="utf-8") as f:
-            for event in events:
-                f.write(json.dumps(event, default=str) + "\n")
+        # Assemble the whole JSONL payload and write it once instead of
+        # one write per event.
+        if orjson is not None:
+            payload = b"".join(
+                orjson.dumps(event, default=_json_default) + b"\n" for event in events
+            )
+        else:
+            payload = "".join(
+                json.dumps(event, default=_json_default) + "\n" for event in events
+            ).encode("utf-8")
+
+        log_path.write_bytes(payload)
 
         logger.info(f"Wrote {len(events)} events to {log_path}")
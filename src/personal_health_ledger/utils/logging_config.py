@@ -10,11 +10,16 @@ from pathlib import Path
 
 from personal_health_ledger.utils.parameters import LoggingConfig
 
+_configured_loggers: set[str | None] = set()
+
 
 def setup_logging(config: LoggingConfig, logger_name: str | None = None) -> logging.Logger:
     """
     Set up logging for the application.
 
+    Handler installation runs once per logger name; repeated calls (e.g.
+    from chained CLI commands) return the already-configured logger.
+
     Args:
         config: Logging configuration.
         logger_name: Optional logger name. If None, returns root logger.
@@ -23,7 +28,13 @@ def setup_logging(config: LoggingConfig, logger_name: str | None = None) -> logg
         Configured logger instance.
     """
     logger = logging.getLogger(logger_name)
-    logger.setLevel(getattr(logging, config.level.upper()))
+
+    if logger_name in _configured_loggers:
+        return logger
+
+    _configured_loggers.add(logger_name)
+    level = getattr(logging, config.level.upper())
+    logger.setLevel(level)
 
     logger.handlers.clear()
 
@@ -31,7 +42,7 @@ def setup_logging(config: LoggingConfig, logger_name: str | None = None) -> logg
 
     if config.console:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, config.level.upper()))
+        console_handler.setLevel(level)
         console_handler.setFormatter(formatter)
         logger.addHandler(console_handler)
 
@@ -40,7 +51,7 @@ def setup_logging(config: LoggingConfig, logger_name: str | None = None) -> logg
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(getattr(logging, config.level.upper()))
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
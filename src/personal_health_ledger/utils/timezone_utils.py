@@ -4,12 +4,20 @@ Timezone and datetime utilities.
 Provides utilities for handling timezone-aware datetime operations.
 """
 
-from datetime import datetime
+import calendar
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 
-import pytz
 from dateutil import parser
 
 
+@lru_cache(maxsize=64)
+def _resolve_timezone(timezone_str: str) -> ZoneInfo:
+    """Resolve a timezone name once per distinct string; called per row."""
+    return ZoneInfo(timezone_str)
+
+
 def make_timezone_aware(
     dt: datetime, timezone_str: str = "America/Santiago", assume_local: bool = False
 ) -> datetime:
@@ -24,13 +32,14 @@ def make_timezone_aware(
     Returns:
         Timezone-aware datetime object.
     """
-    tz = pytz.timezone(timezone_str)
+    tz = _resolve_timezone(timezone_str)
 
     if dt.tzinfo is None:
         if assume_local:
-            return tz.localize(dt)
+            # ZoneInfo attaches directly; no pytz-style localize() call.
+            return dt.replace(tzinfo=tz)
         else:
-            return pytz.utc.localize(dt).astimezone(tz)
+            return dt.replace(tzinfo=timezone.utc).astimezone(tz)
     else:
         return dt.astimezone(tz)
 
@@ -59,6 +68,36 @@ def parse_datetime(
     return make_timezone_aware(dt, timezone_str, assume_local=True)
 
 
+def datetime_to_ns(dt: datetime) -> int:
+    """
+    Convert a datetime to integer nanoseconds since the UTC epoch.
+
+    Args:
+        dt: Datetime object (timezone-aware preferred; naive is treated as UTC).
+
+    Returns:
+        Nanoseconds since 1970-01-01T00:00:00Z as an integer.
+    """
+    return calendar.timegm(dt.utctimetuple()) * 1_000_000_000 + dt.microsecond * 1_000
+
+
+def ns_to_datetime(ns: int, tz: tzinfo | None = None) -> datetime:
+    """
+    Convert integer nanoseconds since the UTC epoch back to a datetime.
+
+    Args:
+        ns: Nanoseconds since the UTC epoch.
+        tz: Optional timezone to convert the result into (defaults to UTC).
+
+    Returns:
+        Timezone-aware datetime object (nanosecond remainder truncated to microseconds).
+    """
+    dt = datetime.fromtimestamp(ns // 1_000_000_000, tz=timezone.utc).replace(
+        microsecond=(ns % 1_000_000_000) // 1_000
+    )
+    return dt.astimezone(tz) if tz is not None else dt
+
+
 def timestamps_match(
     ts1: datetime, ts2: datetime, tolerance_seconds: int = 60
 ) -> bool:
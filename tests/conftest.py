@@ -0,0 +1,36 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from personal_health_ledger.services.consolidation import ConsolidationService
+from personal_health_ledger.utils.parameters import (
+    ConflictResolutionConfig,
+    ProcessingConfig,
+    RecordIDConfig,
+)
+
+
+@pytest.fixture(scope="session")
+def default_processing_config() -> ProcessingConfig:
+    """Processing config shared by the whole test session; never mutated."""
+    return ProcessingConfig(
+        timezone="America/Santiago",
+        timestamp_tolerance_seconds=60,
+        numeric_tolerance=0.001,
+        record_id=RecordIDConfig(
+            algorithm="sha256",
+            timestamp_rounding_seconds=60,
+            include_fields=["timestamp", "weight_kg", "source_types"],
+        ),
+        conflict_resolution=ConflictResolutionConfig(
+            default_preference=None, field_preferences={}
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def consolidation_service(
+    default_processing_config: ProcessingConfig,
+) -> ConsolidationService:
+    """Consolidation service initialized once for the session."""
+    return ConsolidationService(default_processing_config)
@@ -1,42 +1,25 @@
 """Unit tests for comparison service."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-import pytz
+import pytest
 
 from personal_health_ledger.domain.weight import RawWeightRecord, SourceType
 from personal_health_ledger.services.comparison import ComparisonService
-from personal_health_ledger.utils.parameters import (
-    ConflictResolutionConfig,
-    ProcessingConfig,
-    RecordIDConfig,
-)
+from personal_health_ledger.utils.parameters import ProcessingConfig
 
+# Shared measurement timestamps, built once for the module.
+_TS = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+_TS_LATER = datetime(2024, 1, 15, 11, 30, 0, tzinfo=timezone.utc)
 
-def test_comparison_basic() -> None:
-    """Test basic comparison of CSV and FIT records."""
-    config = ProcessingConfig(
-        timezone="America/Santiago",
-        timestamp_tolerance_seconds=60,
-        numeric_tolerance=0.001,
-        record_id=RecordIDConfig(
-            algorithm="sha256",
-            timestamp_rounding_seconds=60,
-            include_fields=["timestamp", "weight_kg", "source_types"],
-        ),
-        conflict_resolution=ConflictResolutionConfig(
-            default_preference=None, field_preferences={}
-        ),
-    )
 
-    service = ComparisonService(config)
-
-    tz = pytz.UTC
-    ts = datetime(2024, 1, 15, 10, 30, 0, tzinfo=tz)
+def test_comparison_basic(default_processing_config: ProcessingConfig) -> None:
+    """Test basic comparison of CSV and FIT records."""
+    service = ComparisonService(default_processing_config)
 
     csv_records = [
         RawWeightRecord(
-            timestamp=ts,
+            timestamp=_TS,
             weight_kg=75.5,
             source_file_name="Peso 1-2024 Huawei Health.csv",
             source_file_id="csv1",
@@ -46,7 +29,7 @@ def test_comparison_basic() -> None:
 
     fit_records = [
         RawWeightRecord(
-            timestamp=ts,
+            timestamp=_TS,
             weight_kg=75.5,
             source_file_name="Peso 1-2024 Huawei Health.fit",
             source_file_id="fit1",
@@ -56,53 +39,29 @@ def test_comparison_basic() -> None:
 
     results = service.compare(csv_records, fit_records)
 
-    if len(results) != 1:
-        raise AssertionError(f"Expected 1 comparison result, got {len(results)}")
+    assert len(results) == 1
 
     result = results[0]
 
-    if result.both_count != 1:
-        raise AssertionError(f"Expected both_count=1, got {result.both_count}")
-
-    if result.csv_only_count != 0:
-        raise AssertionError(f"Expected csv_only_count=0, got {result.csv_only_count}")
+    assert result.both_count == 1
+    assert result.csv_only_count == 0
+    assert result.fit_only_count == 0
 
-    if result.fit_only_count != 0:
-        raise AssertionError(f"Expected fit_only_count=0, got {result.fit_only_count}")
 
-
-def test_comparison_csv_only() -> None:
+def test_comparison_csv_only(default_processing_config: ProcessingConfig) -> None:
     """Test comparison with CSV-only records."""
-    config = ProcessingConfig(
-        timezone="America/Santiago",
-        timestamp_tolerance_seconds=60,
-        numeric_tolerance=0.001,
-        record_id=RecordIDConfig(
-            algorithm="sha256",
-            timestamp_rounding_seconds=60,
-            include_fields=["timestamp", "weight_kg", "source_types"],
-        ),
-        conflict_resolution=ConflictResolutionConfig(
-            default_preference=None, field_preferences={}
-        ),
-    )
-
-    service = ComparisonService(config)
-
-    tz = pytz.UTC
-    ts1 = datetime(2024, 1, 15, 10, 30, 0, tzinfo=tz)
-    ts2 = datetime(2024, 1, 15, 11, 30, 0, tzinfo=tz)
+    service = ComparisonService(default_processing_config)
 
     csv_records = [
         RawWeightRecord(
-            timestamp=ts1,
+            timestamp=_TS,
             weight_kg=75.5,
             source_file_name="Peso 1-2024 Huawei Health.csv",
             source_file_id="csv1",
             source_type=SourceType.CSV,
         ),
         RawWeightRecord(
-            timestamp=ts2,
+            timestamp=_TS_LATER,
             weight_kg=75.6,
             source_file_name="Peso 1-2024 Huawei Health.csv",
             source_file_id="csv1",
@@ -112,7 +71,7 @@ def test_comparison_csv_only() -> None:
 
     fit_records = [
         RawWeightRecord(
-            timestamp=ts1,
+            timestamp=_TS,
             weight_kg=75.5,
             source_file_name="Peso 1-2024 Huawei Health.fit",
             source_file_id="fit1",
@@ -122,45 +81,22 @@ def test_comparison_csv_only() -> None:
 
     results = service.compare(csv_records, fit_records)
 
-    if len(results) != 1:
-        raise AssertionError(f"Expected 1 comparison result, got {len(results)}")
+    assert len(results) == 1
 
     result = results[0]
 
-    if result.both_count != 1:
-        raise AssertionError(f"Expected both_count=1, got {result.both_count}")
+    assert result.both_count == 1
+    assert result.csv_only_count == 1
+    assert result.fit_only_count == 0
 
-    if result.csv_only_count != 1:
-        raise AssertionError(f"Expected csv_only_count=1, got {result.csv_only_count}")
 
-    if result.fit_only_count != 0:
-        raise AssertionError(f"Expected fit_only_count=0, got {result.fit_only_count}")
-
-
-def test_comparison_with_mismatch() -> None:
+def test_comparison_with_mismatch(default_processing_config: ProcessingConfig) -> None:
     """Test comparison with value mismatches."""
-    config = ProcessingConfig(
-        timezone="America/Santiago",
-        timestamp_tolerance_seconds=60,
-        numeric_tolerance=0.001,
-        record_id=RecordIDConfig(
-            algorithm="sha256",
-            timestamp_rounding_seconds=60,
-            include_fields=["timestamp", "weight_kg", "source_types"],
-        ),
-        conflict_resolution=ConflictResolutionConfig(
-            default_preference=None, field_preferences={}
-        ),
-    )
-
-    service = ComparisonService(config)
-
-    tz = pytz.UTC
-    ts = datetime(2024, 1, 15, 10, 30, 0, tzinfo=tz)
+    service = ComparisonService(default_processing_config)
 
     csv_records = [
         RawWeightRecord(
-            timestamp=ts,
+            timestamp=_TS,
             weight_kg=75.5,
             body_fat_pct=18.2,
             source_file_name="Peso 1-2024 Huawei Health.csv",
@@ -171,7 +107,7 @@ def test_comparison_with_mismatch() -> None:
 
     fit_records = [
         RawWeightRecord(
-            timestamp=ts,
+            timestamp=_TS,
             weight_kg=76.0,
             body_fat_pct=18.5,
             source_file_name="Peso 1-2024 Huawei Health.fit",
@@ -182,24 +118,11 @@ def test_comparison_with_mismatch() -> None:
 
     results = service.compare(csv_records, fit_records)
 
-    if len(results) != 1:
-        raise AssertionError(f"Expected 1 comparison result, got {len(results)}")
+    assert len(results) == 1
 
     result = results[0]
 
-    if result.both_count != 1:
-        raise AssertionError(f"Expected both_count=1, got {result.both_count}")
-
-    if "weight_kg" not in result.mismatches:
-        raise AssertionError("Expected 'weight_kg' in mismatches")
-
-    if result.mismatches["weight_kg"] != 1:
-        raise AssertionError(
-            f"Expected 1 weight_kg mismatch, got {result.mismatches['weight_kg']}"
-        )
-
-    if result.weight_mae is None:
-        raise AssertionError("Expected weight_mae to be calculated")
-
-    if abs(result.weight_mae - 0.5) > 0.001:
-        raise AssertionError(f"Expected weight_mae≈0.5, got {result.weight_mae}")
+    assert result.both_count == 1
+    assert "weight_kg" in result.mismatches
+    assert result.mismatches["weight_kg"] == 1
+    assert result.weight_mae == pytest.approx(0.5, abs=0.001)